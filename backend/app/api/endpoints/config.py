@@ -1,15 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from app.models.config import ConfigOptions
-from app.config import CHARACTER_COLORS, LLM_PROVIDERS
+from app.config import CONFIG_OPTIONS_JSON
 
 router = APIRouter()
 
 
 @router.get("/config", response_model=ConfigOptions)
-async def get_config_options() -> ConfigOptions:
+async def get_config_options() -> Response:
     """Get available configuration options."""
-    return ConfigOptions(
-        llm_providers=LLM_PROVIDERS,
-        colors=CHARACTER_COLORS,
-    )
+    return Response(content=CONFIG_OPTIONS_JSON, media_type="application/json")
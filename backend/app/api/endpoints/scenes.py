@@ -1,44 +1,100 @@
 import logging
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, ValidationError
-
-from app.models.scene import SceneConfig, CreateSceneConfig
-from app.services.scene_config_service import SceneConfigService
-from app.utils.error_handling import format_validation_errors
+from typing import Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel, Field, ValidationError
+
+from app.models.scene import SceneConfig, SceneConfigSummary, CreateSceneConfig
+from app.services.scene_cache_service import (
+    PROPOSED_SCENES_KEY,
+    scene_cache,
+    scene_config_key,
+)
+from app.services.scene_config_service import (
+    SceneConfigService,
+    get_scene_config_service,
+)
+from app.utils.error_handling import format_and_log_validation_errors
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-scene_config_service = SceneConfigService()
+
+PROPOSED_SCENES_MAX_PAGE_SIZE = 100
 
 
 class VotePayload(BaseModel):
     vote: int
+    voter_id: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=64,
+        description="Stable voter identifier; repeated votes are deduplicated",
+    )
 
 
 @router.get("/scenes/proposed", response_model=list[SceneConfig])
-async def get_proposed_scenes():
-    """Get all proposed scene configs."""
-    return await scene_config_service.get_proposals()
+async def get_proposed_scenes(
+    limit: Optional[int] = Query(
+        default=None,
+        ge=1,
+        le=PROPOSED_SCENES_MAX_PAGE_SIZE,
+        description="Maximum number of proposals to return (all if omitted)",
+    ),
+    after: Optional[int] = Query(
+        default=None, description="Return proposals created after this scene ID"
+    ),
+    scene_config_service: SceneConfigService = Depends(get_scene_config_service),
+) -> Response:
+    """Get proposed scene configs, oldest first (optionally paginated)."""
+    # Only the full list (polled by the UI) is cached
+    is_cacheable = after is None and limit is None
+    content = await scene_cache.get(PROPOSED_SCENES_KEY) if is_cacheable else None
+    if content is None:
+        scenes = await scene_config_service.get_proposals(limit, after)
+        content = orjson.dumps([scene.model_dump(mode="json") for scene in scenes])
+        if is_cacheable:
+            await scene_cache.set(PROPOSED_SCENES_KEY, content)
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/scenes/proposed/summary", response_model=list[SceneConfigSummary])
+async def get_proposed_scene_summaries(
+    scene_config_service: SceneConfigService = Depends(get_scene_config_service),
+):
+    """Get summaries of all proposed scene configs."""
+    return await scene_config_service.get_proposal_summaries()
 
 
 @router.get("/scenes/{scene_config_id}", response_model=SceneConfig)
-async def get_scene_config(scene_config_id: str):
+async def get_scene_config(
+    scene_config_id: str,
+    scene_config_service: SceneConfigService = Depends(get_scene_config_service),
+) -> Response:
     """Get a scene config by ID."""
-    scene = await scene_config_service.get_by_id(int(scene_config_id))
-    if not scene:
-        raise HTTPException(status_code=404, detail="Scene not found")
-    return scene
+    cache_key = scene_config_key(int(scene_config_id))
+    content = await scene_cache.get(cache_key)
+    if content is None:
+        scene = await scene_config_service.get_by_id(int(scene_config_id))
+        if not scene:
+            raise HTTPException(status_code=404, detail="Scene not found")
+        content = orjson.dumps(scene.model_dump(mode="json"))
+        await scene_cache.set(cache_key, content)
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("/scenes/propose", response_model=SceneConfig)
-async def propose_scene(scene_config: CreateSceneConfig):
+async def propose_scene(
+    scene_config: CreateSceneConfig,
+    scene_config_service: SceneConfigService = Depends(get_scene_config_service),
+):
     """Propose a new scene config."""
     try:
         return await scene_config_service.create_scene_config_proposal(scene_config)
     except ValidationError as e:
-        formatted_errors = format_validation_errors(e)
+        formatted_errors = format_and_log_validation_errors(e)
         raise HTTPException(
             status_code=422,
             detail={
@@ -53,12 +109,20 @@ async def propose_scene(scene_config: CreateSceneConfig):
 
 
 @router.post("/scenes/{scene_config_id}/vote")
-async def vote_scene(scene_config_id: str, payload: VotePayload) -> SceneConfig:
+async def vote_scene(
+    scene_config_id: str,
+    payload: VotePayload,
+    scene_config_service: SceneConfigService = Depends(get_scene_config_service),
+) -> SceneConfig:
     """Vote on a scene config proposal."""
     if payload.vote not in [-1, 1]:
         raise HTTPException(status_code=400, detail="Vote must be -1 or 1")
 
     try:
+        if payload.voter_id is not None:
+            return await scene_config_service.cast_vote(
+                int(scene_config_id), payload.voter_id, payload.vote
+            )
         return await scene_config_service.increment_votes(
             int(scene_config_id), payload.vote
         )
@@ -70,13 +134,21 @@ async def vote_scene(scene_config_id: str, payload: VotePayload) -> SceneConfig:
 
 
 @router.post("/scenes/{scene_config_id}/reject")
-async def reject_scene(scene_config_id: str):
+async def reject_scene(
+    scene_config_id: str,
+    scene_config_service: SceneConfigService = Depends(get_scene_config_service),
+):
     """Reject a proposed scene config."""
     return await scene_config_service.reject_proposal(int(scene_config_id))
 
 
 @router.post("/scenes/{scene_config_id}/comment")
-async def add_comment(scene_config_id: str, user: str, comment: str):
+async def add_comment(
+    scene_config_id: str,
+    user: str,
+    comment: str,
+    scene_config_service: SceneConfigService = Depends(get_scene_config_service),
+):
     """Add a comment to a scene config proposal."""
     return await scene_config_service.add_comment_on_proposal(
         int(scene_config_id), user, comment
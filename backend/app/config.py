@@ -1,6 +1,9 @@
-from typing import List
+from types import MappingProxyType
+from typing import List, Mapping
 
-from app.models.config import ColorOption, LLMModel, LLMProvider
+import orjson
+
+from app.models.config import ColorOption, ConfigOptions, LLMModel, LLMProvider
 
 # System prompt
 SYSTEM_PROMPT = """You are {character_name}.
@@ -16,15 +19,15 @@ Scene description:
 {scene_description}
 ```
 
-Current conversation duration: {conversation_length} messages.
-Time: {current_time}
-
 IMPORTANT RULES:
 1. Keep responses natural, 1-2 sentences
 2. Choose a mood that matches your personality
 3. Select an appropriate emoji for the mood
 4. Stay in character at all times
-5. Respond to the context of the conversation and your current situation"""
+5. Respond to the context of the conversation and your current situation
+
+Current conversation duration: {conversation_length} messages.
+Time: {current_time}"""
 
 # Tile size
 TILE_SIZE = 48
@@ -121,3 +124,19 @@ CHARACTER_COLORS: List[ColorOption] = [
     ColorOption(id="cyan", name="Cyan", hex="#06b6d4", group="nature"),
     ColorOption(id="sky", name="Sky", hex="#0ea5e9", group="nature"),
 ]
+
+# Read-only color lookups by ID
+CHARACTER_COLORS_BY_ID: Mapping[str, ColorOption] = MappingProxyType(
+    {color.id: color for color in CHARACTER_COLORS}
+)
+CHARACTER_COLOR_RGB: Mapping[str, int] = MappingProxyType(
+    {color.id: int(color.hex[1:], 16) for color in CHARACTER_COLORS}
+)
+
+# Pre-serialized `/config` response body (static at runtime)
+CONFIG_OPTIONS_JSON: bytes = orjson.dumps(
+    ConfigOptions(
+        llm_providers=LLM_PROVIDERS,
+        colors=CHARACTER_COLORS,
+    ).model_dump(mode="json")
+)
@@ -26,6 +26,11 @@ class Settings(BaseSettings):
     POSTGRES_DB: Optional[str] = None
     POSTGRES_SCHEMA: str = "pixeltales"
 
+    # PostgreSQL connection pool (sized for the Supabase pooler's per-tenant limit)
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 5
+    POSTGRES_POOL_RECYCLE: int = 300  # seconds
+
     @property
     def database_url(self) -> str:
         """Get the database URL."""
@@ -36,6 +41,19 @@ class Settings(BaseSettings):
             return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         raise ValueError(f"Unsupported database type: {self.DB_TYPE}")
 
+    # Redis (optional, enables the scene response cache)
+    REDIS_HOST: Optional[str] = None
+    REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+    SCENE_CACHE_TTL: int = 30  # seconds
+    # Fan out Socket.IO events through Redis pub/sub (requires REDIS_HOST)
+    SOCKETIO_USE_REDIS: bool = False
+
+    @property
+    def redis_url(self) -> str:
+        """Get the Redis URL."""
+        return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
+
     # Port settings
     FRONTEND_PORT: str = "5173"  # Default development port
     BACKEND_PORT: str = "8000"  # Default backend port
@@ -57,6 +75,7 @@ class Settings(BaseSettings):
 
     # LLMs
     DEFAULT_MODEL: str = "gpt-4o-mini"
+    LLM_MAX_CONCURRENCY: int = 32  # max in-flight LLM requests per process
 
     # OpenAI
     OPENAI_API_KEY: Optional[SecretStr] = None
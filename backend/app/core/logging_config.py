@@ -0,0 +1,35 @@
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+
+def setup_logging(level: int = logging.INFO) -> QueueListener:
+    """Configure non-blocking logging for the `app` loggers.
+
+    Records are put on an in-memory queue by the event loop thread and written
+    to stderr by a `QueueListener` thread, so log I/O never blocks the loop.
+
+    Args:
+        level: Log level of the `app` loggers
+
+    Returns:
+        The started queue listener (stop it on shutdown to flush the queue)
+    """
+    log_queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+            datefmt="%H:%M:%S",
+        )
+    )
+    listener = QueueListener(log_queue, stream_handler)
+
+    app_logger = logging.getLogger("app")
+    app_logger.handlers = [QueueHandler(log_queue)]  # idempotent across restarts
+    app_logger.setLevel(level)
+    app_logger.propagate = False
+
+    listener.start()
+    return listener
@@ -1,6 +1,8 @@
 import logging
 from typing import AsyncGenerator, Dict, Any
 
+import orjson
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.schema import CreateSchema
@@ -10,26 +12,53 @@ from app.core.config import settings
 # Set up logger
 logger = logging.getLogger(__name__)
 
+
+def json_serializer(value: Any) -> str:
+    """Serialize JSON columns with orjson."""
+    return orjson.dumps(value).decode()
+
+
 # Configure engine args based on database type
 engine_args: Dict[str, Any] = {
     "echo": False,  # Set to True for SQL query logging
+    "json_serializer": json_serializer,
+    "json_deserializer": orjson.loads,
 }
 
 if settings.DB_TYPE == "postgresql":
     # PostgreSQL-specific settings for Supabase
     engine_args.update(
         {
-            "pool_pre_ping": True,
-            "pool_size": 20,
-            "max_overflow": 10,
+            # No per-checkout `SELECT 1`; dead connections are detected by
+            # TCP keepalives and connections are recycled periodically
+            "pool_pre_ping": False,
+            "pool_size": settings.POSTGRES_POOL_SIZE,
+            "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
             "pool_timeout": 30,
-            "pool_recycle": 1800,
+            "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+            "pool_use_lifo": True,  # Reuse the most recently returned connection
             "connect_args": {
-                "server_settings": {"search_path": settings.POSTGRES_SCHEMA}
+                "server_settings": {
+                    "search_path": settings.POSTGRES_SCHEMA,
+                    "tcp_keepalives_idle": "60",  # seconds
+                    "tcp_user_timeout": "30000",  # milliseconds
+                },
+                # The Supabase pooler (transaction mode) doesn't support
+                # server-side prepared statements, so disable both caches
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
             },
         }
     )
 
+elif settings.DB_TYPE == "sqlite":
+    # SQLite-specific settings
+    engine_args.update(
+        {
+            "connect_args": {"check_same_thread": False, "timeout": 30},
+        }
+    )
+
 # Create async engine using settings
 logger.info(f"Creating database engine with URL: {settings.database_url}")
 engine = create_async_engine(
@@ -37,6 +66,20 @@ engine = create_async_engine(
     **engine_args,
 )
 
+if settings.DB_TYPE == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+        """Enable WAL mode and relaxed fsync on each new SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.execute("PRAGMA cache_size=-64000")  # 64 MB
+        cursor.close()
+
+
 # Create async session factory
 async_session = async_sessionmaker(
     engine,
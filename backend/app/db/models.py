@@ -1,10 +1,9 @@
 from datetime import UTC, datetime
 import time
-from typing import Any, cast
+from typing import Any
 
-from sqlalchemy import ForeignKey, event, Update, Table
-from sqlalchemy.orm import Mapped, mapped_column, relationship, Mapper
-from sqlalchemy.engine.base import Connection
+from sqlalchemy import ForeignKey, Index, UniqueConstraint, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import JSON, Float, Integer, String
 
 from app.config import SYSTEM_PROMPT
@@ -12,15 +11,35 @@ from app.db.database import Base
 from app.core.config import settings
 from app.models.scene import CreateSceneConfig, SceneState, SceneConfigStatus
 
+# Schema-qualified table args and foreign keys (PostgreSQL only)
+_IS_PG = settings.DB_TYPE == "postgresql"
+_FK_PREFIX = f"{settings.POSTGRES_SCHEMA}." if _IS_PG else ""
+_SCHEMA_ARGS: tuple[dict[str, Any], ...] = (
+    ({"schema": settings.POSTGRES_SCHEMA},) if _IS_PG else ()
+)
+SCENE_CONFIGS_FK = f"{_FK_PREFIX}scene_configs.id"
+SCENES_FK = f"{_FK_PREFIX}scenes.id"
+
 
 class DBSceneConfig(Base):
     """Model for storing scene configurations."""
 
     __tablename__ = "scene_configs"
     __table_args__ = (
-        {"schema": settings.POSTGRES_SCHEMA}
-        if settings.DB_TYPE == "postgresql"
-        else None
+        # Serves the proposals listing (scanned backwards for oldest first)
+        Index(
+            "ix_scene_configs_status_created_at",
+            "status",
+            text("created_at DESC"),
+        ),
+        # Serves the "highest voted proposal" lookup
+        Index(
+            "ix_scene_configs_proposed_votes",
+            text("votes DESC"),
+            postgresql_where=text("status = 'proposed'"),
+            sqlite_where=text("status = 'proposed'"),
+        ),
+        *_SCHEMA_ARGS,
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -44,7 +63,7 @@ class DBSceneConfig(Base):
     def __init__(
         self,
         config: CreateSceneConfig,
-        created_at: float = datetime.now(UTC).timestamp(),
+        created_at: float | None = None,
         system_prompt: str = SYSTEM_PROMPT,
     ):
         super().__init__()
@@ -53,44 +72,19 @@ class DBSceneConfig(Base):
         self.system_prompt = system_prompt
         self.votes = config.votes or 0
         self.status = config.status
-        self.created_at = created_at
-
-
-# Event listener to sync ID to config after insert
-@event.listens_for(DBSceneConfig, "after_insert")
-def receive_after_insert(
-    mapper: Mapper[Any], connection: Connection, target: DBSceneConfig
-) -> None:
-    """After a DBSceneConfig is inserted, sync its ID to the config dict."""
-    target.config["id"] = target.id
-    # Get the table object and cast it to Table type
-    table = cast(Table, mapper.local_table)
-    # Update the config column in the database using type-safe Update
-    stmt = Update(table).where(table.c.id == target.id).values(config=target.config)
-    connection.execute(stmt)
+        self.created_at = created_at if created_at is not None else time.time()
 
 
 class DBScene(Base):
     """Model for storing scenes."""
 
     __tablename__ = "scenes"
-    __table_args__ = (
-        {"schema": settings.POSTGRES_SCHEMA}
-        if settings.DB_TYPE == "postgresql"
-        else None
-    )
+    __table_args__ = _SCHEMA_ARGS
 
     id: Mapped[int] = mapped_column(primary_key=True)
     created_at: Mapped[float] = mapped_column(Float, index=True)  # unix timestamp
     config_id: Mapped[int] = mapped_column(
-        ForeignKey(
-            (
-                f"{settings.POSTGRES_SCHEMA}.scene_configs.id"
-                if settings.DB_TYPE == "postgresql"
-                else "scene_configs.id"
-            ),
-            ondelete="CASCADE",
-        )
+        ForeignKey(SCENE_CONFIGS_FK, ondelete="CASCADE")
     )
 
     # Relationship to config
@@ -104,7 +98,9 @@ class DBScene(Base):
     def __init__(self, config_id: int, created_at: float | None = None):
         super().__init__()
         self.config_id = config_id
-        self.created_at = created_at or datetime.now(UTC).timestamp()
+        self.created_at = (
+            created_at if created_at is not None else datetime.now(UTC).timestamp()
+        )
 
 
 class DBSceneStateSnapshot(Base):
@@ -112,33 +108,21 @@ class DBSceneStateSnapshot(Base):
 
     __tablename__ = "scene_state_snapshots"
     __table_args__ = (
-        {"schema": settings.POSTGRES_SCHEMA}
-        if settings.DB_TYPE == "postgresql"
-        else None
+        # Serves "latest snapshot of a scene" lookups and scene cascade deletes
+        Index(
+            "ix_scene_state_snapshots_scene_id_timestamp",
+            "scene_id",
+            text("timestamp DESC"),
+        ),
+        *_SCHEMA_ARGS,
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     timestamp: Mapped[float] = mapped_column(Float, index=True)  # unix timestamp
     state: Mapped[dict[str, Any]] = mapped_column(JSON)  # Complete SceneState as JSON
-    scene_id: Mapped[int] = mapped_column(
-        ForeignKey(
-            (
-                f"{settings.POSTGRES_SCHEMA}.scenes.id"
-                if settings.DB_TYPE == "postgresql"
-                else "scenes.id"
-            ),
-            ondelete="CASCADE",
-        )
-    )
+    scene_id: Mapped[int] = mapped_column(ForeignKey(SCENES_FK, ondelete="CASCADE"))
     config_id: Mapped[int] = mapped_column(
-        ForeignKey(
-            (
-                f"{settings.POSTGRES_SCHEMA}.scene_configs.id"
-                if settings.DB_TYPE == "postgresql"
-                else "scene_configs.id"
-            ),
-            ondelete="CASCADE",
-        )
+        ForeignKey(SCENE_CONFIGS_FK, ondelete="CASCADE")
     )
 
     # Relationship to config
@@ -150,6 +134,26 @@ class DBSceneStateSnapshot(Base):
     def __init__(self, state: SceneState, timestamp: float | None = None):
         super().__init__()
         self.state = state.model_dump()
-        self.timestamp = timestamp or time.time()
+        self.timestamp = timestamp if timestamp is not None else time.time()
         self.config_id = state.scene_config_id
         self.scene_id = state.scene_id
+
+
+class DBSceneConfigVote(Base):
+    """Model for storing one vote per voter and scene config."""
+
+    __tablename__ = "scene_config_votes"
+    __table_args__ = (
+        UniqueConstraint(
+            "scene_config_id", "voter_id", name="uq_scene_config_votes_voter"
+        ),
+        *_SCHEMA_ARGS,
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    scene_config_id: Mapped[int] = mapped_column(
+        ForeignKey(SCENE_CONFIGS_FK, ondelete="CASCADE")
+    )
+    voter_id: Mapped[str] = mapped_column(String)
+    value: Mapped[int] = mapped_column(Integer)  # -1 or 1
+    previous_value: Mapped[int] = mapped_column(Integer, default=0)  # before upsert
@@ -1,14 +1,20 @@
 from typing import Any, Dict
+import logging
 import socketio  # type: ignore
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.logging_config import setup_logging
 from app.services.scene_manager import SceneManager
 from app.api.endpoints import config, scenes
+from app.utils import socket_json
 
+# Set up logger
+logger = logging.getLogger(__name__)
 
 # Initialize scene manager
 scene_manager = SceneManager()
@@ -18,11 +24,12 @@ scene_manager = SceneManager()
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI app."""
     # Startup
+    log_listener = setup_logging()
     sio = app.state.socket_server
     await scene_manager.set_socket_instance(sio)
     yield
     # Shutdown
-    # Add cleanup code here if needed
+    log_listener.stop()
 
 
 # Create FastAPI app
@@ -31,6 +38,7 @@ app = FastAPI(
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -38,8 +46,9 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let Starlette precompute the preflight response headers
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
 )
 
 # Include routers
@@ -48,7 +57,15 @@ app.include_router(scenes.router, prefix=settings.API_V1_STR, tags=["scenes"])
 
 # Create Socket.IO server
 sio = socketio.AsyncServer(
-    async_mode="asgi", cors_allowed_origins=settings.cors_origins
+    async_mode="asgi",
+    cors_allowed_origins=settings.cors_origins,
+    json=socket_json,  # orjson-backed encoding of emitted events
+    # Share broadcasts across server processes via Redis pub/sub
+    client_manager=(
+        socketio.AsyncRedisManager(settings.redis_url)
+        if settings.SOCKETIO_USE_REDIS and settings.REDIS_HOST
+        else None
+    ),
 )
 
 # Store socket server in app state
@@ -62,7 +79,7 @@ socket_app = socketio.ASGIApp(socketio_server=sio, other_asgi_app=app)
 @sio.event  # type: ignore
 async def connect(sid: str, environ: Dict[str, Any]):
     """Handle client connection"""
-    print(f"Client connected: {sid}")
+    logger.info("Client connected: %s", sid)
     # Inform scene manager about new visitor
     await scene_manager.add_visitor(sid)
 
@@ -70,7 +87,7 @@ async def connect(sid: str, environ: Dict[str, Any]):
 @sio.event  # type: ignore
 async def disconnect(sid: str):
     """Handle client disconnection"""
-    print(f"Client disconnected: {sid}")
+    logger.info("Client disconnected: %s", sid)
     await scene_manager.remove_visitor(sid)
 
 
@@ -1,5 +1,5 @@
 from typing import Literal
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 Direction = Literal["front", "right", "left", "back"]
@@ -8,5 +8,8 @@ Direction = Literal["front", "right", "left", "back"]
 class Position(BaseModel):
     """A position in the scene."""
 
+    # Immutable and closed, so instances can be shared between config and state
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     x: float
     y: float
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Deque, Optional
 from pydantic import BaseModel
 
 #
@@ -31,4 +31,4 @@ class Message(BaseModel):
 class Conversation(BaseModel):
     """A conversation."""
 
-    messages: List[Message]
+    messages: Deque[Message]  # most recent messages (bounded by the context window)
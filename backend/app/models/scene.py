@@ -110,13 +110,24 @@ class SceneConfig(SceneConfigBase):
     )
 
 
+class SceneConfigSummary(BaseModel):
+    """Lightweight projection of a scene config for list views."""
+
+    id: int
+    name: str
+    proposer_name: Optional[str] = None
+    proposed_at: Optional[str] = None
+    votes: int
+
+
 class SceneState(SceneBase):
     """State of the scene."""
 
     scene_id: int
     scene_config_id: int
     characters: Dict[str, CharacterState]
-    messages: List[Message]
+    messages: List[Message]  # most recent messages (bounded by the retention)
+    messages_offset: int = 0  # number of earlier messages trimmed from `messages`
     started_at: float  # Unix timestamp (Epoch time)
     conversation_active: bool
     conversation_ended: bool
@@ -2,13 +2,19 @@ import logging
 import random
 import time
 import asyncio
+from collections import deque
 from datetime import datetime
-from typing import List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
 from langchain.schema import AIMessage, HumanMessage
 
+from app.core.config import settings
 from app.models.scene import Scene
-from app.services.llm_manager import LLMManager, SystemPromptTemplateVars
+from app.services.llm_manager import (
+    CharacterResponse,
+    LLMManager,
+    SystemPromptTemplateVars,
+)
 from app.models.conversation import Conversation, Message
 
 
@@ -25,12 +31,47 @@ class ConversationManager:
         self.base_speaking_time = 5.0  # Base speaking time in seconds
         self.char_speaking_time = 0.05  # Additional seconds per character
         self.end_conversation_request_validity = 180.0  # 3 minutes in seconds
+        self.max_retries = 3  # LLM attempts per message
+        # Exponential backoff before each retry in seconds (0.5s, 1s, ...)
+        self.retry_backoff = tuple(0.5 * 2**i for i in range(self.max_retries - 1))
 
         self.llm_manager = llm_manager
         self.conversation: Conversation | None = None
+        # Bounds in-flight LLM requests (retries included)
+        self._llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        # Scene descriptions by scene id (immutable for the scene's lifetime)
+        self._scene_descriptions: Dict[int, str] = {}
+        # Prompt variables fixed for a character in a scene, by (scene id, character id)
+        self._static_prompt_vars: Dict[Tuple[int, str], Dict[str, str]] = {}
+        # LLM history messages as seen by each character, kept in sync with
+        # the conversation (built once per message instead of once per turn)
+        self._histories: Dict[str, Deque[HumanMessage | AIMessage]] = {}
 
     def init_conversation(self, messages: List[Message] = []) -> None:
-        self.conversation = Conversation(messages=messages)
+        self.conversation = Conversation(
+            messages=deque(messages, maxlen=self.context_window)
+        )
+        self._scene_descriptions.clear()
+        self._static_prompt_vars.clear()
+        self._histories.clear()
+
+    def add_message(self, message: Message) -> None:
+        """Add a message to the conversation history."""
+        if self.conversation is None:
+            raise ValueError("Conversation not set")
+        self.conversation.messages.append(message)
+        for characterId, history in self._histories.items():
+            history.append(self._to_history_message(message, characterId))
+
+    def _to_history_message(
+        self, message: Message, characterId: str
+    ) -> HumanMessage | AIMessage:
+        """Convert a message to an LLM history message from a character's view."""
+        # Contents are plain strings, so the messages are built without
+        # re-running LangChain's validation
+        return (
+            AIMessage if message.character == characterId else HumanMessage
+        ).model_construct(content=message.content or "...")
 
     def get_end_conversation_request_validity(self) -> float:
         return self.end_conversation_request_validity
@@ -41,15 +82,18 @@ class ConversationManager:
         """Prepare the conversation history."""
         if self.conversation is None:
             raise ValueError("Conversation not set")
-        history: List[HumanMessage | AIMessage] = []
-        for msg in self.conversation.messages[
-            -self.context_window :
-        ]:  # Last N messages for context
-            if msg.character != characterId:
-                history.append(HumanMessage(content=msg.content or "..."))
-            else:
-                history.append(AIMessage(content=msg.content or "..."))
-        return history
+        # Last N messages for context
+        history = self._histories.get(characterId)
+        if history is None:
+            history = deque(
+                (
+                    self._to_history_message(msg, characterId)
+                    for msg in self.conversation.messages
+                ),
+                maxlen=self.context_window,
+            )
+            self._histories[characterId] = history
+        return list(history)
 
     def _prepare_scene_description(
         self, scene_description: str, characters_description: str
@@ -57,27 +101,49 @@ class ConversationManager:
         """Prepare the scene description."""
         return f"{scene_description}\n\nCharacters:\n{characters_description}"
 
+    def _get_scene_description(self, scene: Scene) -> str:
+        """Get the scene description, built once per scene."""
+        scene_description = self._scene_descriptions.get(scene.id)
+        if scene_description is None:
+            characters_description = "\n".join(
+                [f"- {char.visual}" for char in scene.state.characters.values()]
+            )
+            scene_description = self._prepare_scene_description(
+                scene.config.description, characters_description
+            )
+            self._scene_descriptions[scene.id] = scene_description
+        return scene_description
+
+    def _get_static_prompt_vars(self, scene: Scene, characterId: str) -> Dict[str, str]:
+        """Get the prompt variables of a character that are fixed for the scene."""
+        key = (scene.id, characterId)
+        static_vars = self._static_prompt_vars.get(key)
+        if static_vars is None:
+            character = scene.state.characters[characterId]
+            static_vars = {
+                "character_name": character.name,
+                "character_visual": character.visual,
+                "character_role": character.role,
+                "scene_description": self._get_scene_description(scene),
+            }
+            self._static_prompt_vars[key] = static_vars
+        return static_vars
+
     def _prepare_system_message(
         self, scene: Scene, characterId: str, message_recipient: Optional[str] = None
     ) -> SystemPromptTemplateVars:
         """Prepare the system message for the scene with character context."""
-        characters_description = "\n".join(
-            [f"- {char.visual}" for char in scene.state.characters.values()]
-        )
         return {
-            "character_name": scene.state.characters[characterId].name,
-            "character_visual": scene.state.characters[characterId].visual,
-            "character_role": scene.state.characters[characterId].role,
+            **self._get_static_prompt_vars(scene, characterId),
             "message_recipient": message_recipient or "",
-            "scene_description": self._prepare_scene_description(
-                scene.config.description, characters_description
-            ),
             "input": (
                 "Start a conversation."
                 if not scene.state.messages
                 else "Continue the conversation naturally."
             ),
-            "conversation_length": str(len(scene.state.messages)),
+            "conversation_length": str(
+                scene.state.messages_offset + len(scene.state.messages)
+            ),
             "current_time": datetime.now().strftime("%I:%M %p"),
         }
 
@@ -89,56 +155,52 @@ class ConversationManager:
         self, scene: Scene, characterId: str, recipient: Optional[str] = None
     ) -> Message:
         """Generate a message for the current speaker."""
+        response = await self.generate_response(scene, characterId, recipient)
+        return self.create_message(characterId, response)
+
+    def create_message(self, characterId: str, response: CharacterResponse) -> Message:
+        """Create a message of a character from its LLM response."""
+        # Calculate speaking time
+        calculated_speaking_time = self._calculate_speaking_time(
+            len(response.content or "")
+        )
 
-        if self.conversation is None:
-            raise ValueError("Conversation not set")
+        # Read the clock once so both timestamps match
+        unix_timestamp = time.time()
+
+        # Create message (response is already validated by the LLM parser,
+        # and all of its fields are message fields)
+        return Message.model_construct(
+            character=characterId,
+            timestamp=datetime.fromtimestamp(unix_timestamp).isoformat(),
+            unix_timestamp=unix_timestamp,
+            calculated_speaking_time=calculated_speaking_time,
+            **dict(response),
+        )
 
-        # Load current messages into conversation from scene state
-        self.conversation.messages = scene.state.messages
+    async def generate_response(
+        self, scene: Scene, characterId: str, recipient: Optional[str] = None
+    ) -> CharacterResponse:
+        """Generate the LLM response of the current speaker (with retries)."""
 
-        # Prepare system message with enhanced context
-        system_vars = self._prepare_system_message(scene, characterId, recipient)
+        if self.conversation is None:
+            raise ValueError("Conversation not set")
 
-        # Prepare conversation history
-        history = self._prepare_conversation_history(characterId)
+        # Prepare system message with enhanced context and conversation history
+        prompt_vars = self._prepare_system_message(scene, characterId, recipient)
+        prompt_vars["history"] = self._prepare_conversation_history(characterId)
 
-        max_retries = 3
+        max_retries = self.max_retries
         retry_count = 0
-        backoff_time = 0.5  # Start with 0.5s delay
         last_raw_response = None
 
         while retry_count < max_retries:
             try:
                 # Generate response with structured output
-                response = await self.llm_manager.generate_response(
-                    characterId,
-                    {
-                        **system_vars,
-                        "history": history,
-                    },
-                )
-
-                # Calculate speaking time
-                calculated_speaking_time = self._calculate_speaking_time(
-                    len(response.content or "")
-                )
-
-                # Create message
-                return Message(
-                    character=characterId,
-                    timestamp=datetime.now().isoformat(),
-                    unix_timestamp=time.time(),
-                    calculated_speaking_time=calculated_speaking_time,
-                    # From response
-                    content=response.content,
-                    recipient=response.recipient,
-                    thoughts=response.thoughts,
-                    mood=response.mood,
-                    mood_emoji=response.mood_emoji,
-                    reaction_on_previous_message=response.reaction_on_previous_message,
-                    conversation_rating=response.conversation_rating,
-                    end_conversation=response.end_conversation,
-                )
+                async with self._llm_semaphore:
+                    return await self.llm_manager.generate_response(
+                        characterId, prompt_vars
+                    )
 
             except Exception as e:
                 retry_count += 1
@@ -170,8 +232,8 @@ class ConversationManager:
                     break
 
                 # Exponential backoff with jitter
-                jitter = random.uniform(0, 0.1)
-                await asyncio.sleep(backoff_time + jitter)
-                backoff_time *= 2  # Double the backoff time for next retry
+                await asyncio.sleep(
+                    self.retry_backoff[retry_count - 1] + random.random() * 0.1
+                )
 
         raise RuntimeError(f"Failed to generate message after {max_retries} retries")
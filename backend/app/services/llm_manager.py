@@ -1,16 +1,27 @@
-from typing import Dict, List, Optional, Union, Sequence, cast
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union, Sequence, cast
 
+import httpx
 from pydantic import BaseModel, Field
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
-from langchain_core.output_parsers import PydanticOutputParser
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+)
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import Runnable, RunnableSerializable
 
 from app.models.llm import LLMConfig
 from app.models.scene import SceneConfig
 from app.core.config import settings
+from app.utils.prompt_template import (
+    PromptRenderer,
+    compile_prompt_template,
+    split_prompt_template,
+)
 
 
 # Character response schema
@@ -45,6 +56,17 @@ class CharacterResponse(BaseModel):
     # )
 
 
+# The system prompt is rendered per call and passed as a message, so the chat
+# prompt template is the same for every scene
+CONVERSATION_PROMPT = ChatPromptTemplate.from_messages(  # type: ignore
+    [
+        MessagesPlaceholder(variable_name="system_message"),
+        MessagesPlaceholder(variable_name="history"),
+        ("human", "{input}"),
+    ]
+)
+
+
 # Type aliases
 
 LLMConfigHash = int
@@ -53,7 +75,37 @@ LLMRunnable = Runnable[
     CharacterResponse,  # Output type
 ]
 
-SystemPromptTemplateVars = Dict[str, str | List[HumanMessage | AIMessage]]
+SystemPromptTemplateVars = Dict[
+    str, str | List[HumanMessage | AIMessage] | List[SystemMessage]
+]
+
+# Connection pool shared by the OpenAI clients of all characters and scenes, so
+# new LLM instances reuse warm (TCP + TLS) connections. Idle connections are
+# kept longer than a conversation turn (httpx default: 5 seconds)
+openai_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0
+    )
+)
+
+# System prompt variables that change between calls for the same character;
+# the system prompt up to the first of them is sent as a cacheable block
+VOLATILE_PROMPT_VARS = frozenset(
+    {"message_recipient", "input", "conversation_length", "current_time"}
+)
+
+
+@lru_cache(maxsize=16)
+def compile_system_prompt(system_prompt: str) -> Tuple[PromptRenderer, PromptRenderer]:
+    """Compile a system prompt into renderers of its stable prefix and the rest.
+
+    Cached, since scenes almost always share the same system prompt. The
+    response schema is sent as the structured output tool definition, so a
+    `{format_instructions}` placeholder (in stored prompts) is dropped.
+    """
+    system_prompt = system_prompt.replace("{format_instructions}", "")
+    prefix, suffix = split_prompt_template(system_prompt, VOLATILE_PROMPT_VARS)
+    return compile_prompt_template(prefix), compile_prompt_template(suffix)
 
 
 class LLMManager:
@@ -64,6 +116,8 @@ class LLMManager:
 
         self.llms: Dict[LLMConfigHash, LLMRunnable] | None = None
         self.prompt: ChatPromptTemplate | None = None
+        self.render_system_prompt_prefix: PromptRenderer | None = None
+        self.render_system_prompt_suffix: PromptRenderer | None = None
         self.chains: (
             Dict[
                 LLMConfigHash,
@@ -73,6 +127,17 @@ class LLMManager:
         ) = None
         self.llm_configs: Dict[LLMConfigHash, LLMConfig] | None = None
         self.external_id_to_llm_hash_map: Dict[str, LLMConfigHash] | None = None
+        # Per-character lookups resolved at scene init for `generate_response`
+        self.llm_configs_by_external_id: Dict[str, LLMConfig] | None = None
+        self.chains_by_external_id: (
+            Dict[str, RunnableSerializable[SystemPromptTemplateVars, CharacterResponse]]
+            | None
+        ) = None
+
+        # LLM instances and chains are reused across scenes with equal
+        # (hashable) configs
+        self._get_llm = lru_cache(maxsize=128)(self._create_llm)
+        self._get_chain = lru_cache(maxsize=128)(self._create_chain)
 
     def init_scene(self, scene_config: SceneConfig) -> None:
         """Initialize the LLMs for the scene."""
@@ -86,6 +151,7 @@ class LLMManager:
             self.llm_configs,
             self.external_id_to_llm_hash_map,
         ) = self._reduce_llm_config(llm_configs_by_external_id)
+        self.llm_configs_by_external_id = llm_configs_by_external_id
         self._init_llms()
         self.init_conversation_chain(scene_config.system_prompt)
 
@@ -93,12 +159,16 @@ class LLMManager:
         self, llm_configs_by_id: dict[str, LLMConfig]
     ) -> tuple[dict[LLMConfigHash, LLMConfig], dict[str, LLMConfigHash]]:
         """Reduce the LLM configs to a reduced LLM config map."""
+        llm_config_hashes = {
+            char_id: hash(llm_config)
+            for char_id, llm_config in llm_configs_by_id.items()
+        }
         return (
-            {hash(llm_config): llm_config for llm_config in llm_configs_by_id.values()},
             {
-                char_id: hash(llm_config)
+                llm_config_hashes[char_id]: llm_config
                 for char_id, llm_config in llm_configs_by_id.items()
             },
+            llm_config_hashes,
         )
 
     def _init_llms(self) -> None:
@@ -109,17 +179,25 @@ class LLMManager:
 
         # Initialize LLMs for each character with structured output support
         self.llms = {
-            llm_config_hash: cast(
-                LLMRunnable,
-                self._get_model_instance(
-                    self.llm_configs[llm_config_hash]
-                ).with_structured_output(  # type: ignore
-                    schema=CharacterResponse, method="function_calling", strict=True
-                ),
-            )
-            for llm_config_hash in self.llm_configs.keys()
+            llm_config_hash: self._get_llm(llm_config)
+            for llm_config_hash, llm_config in self.llm_configs.items()
         }
 
+    def _create_llm(self, config: LLMConfig) -> LLMRunnable:
+        """Create an LLM with structured output support."""
+        return cast(
+            LLMRunnable,
+            self._get_model_instance(config).with_structured_output(  # type: ignore
+                schema=CharacterResponse, method="function_calling", strict=True
+            ),
+        )
+
+    def _create_chain(
+        self, config: LLMConfig
+    ) -> RunnableSerializable[SystemPromptTemplateVars, CharacterResponse]:
+        """Create the conversation chain of an LLM."""
+        return CONVERSATION_PROMPT | self._get_llm(config)
+
     def init_conversation_chain(self, system_prompt: str) -> None:
         """Initialize the conversation chain for the scene."""
 
@@ -129,23 +207,27 @@ class LLMManager:
         if self.llms is None:
             raise ValueError("LLMs not initialized")
 
-        # Initialize conversation chain with improved format instructions
-        self.prompt = ChatPromptTemplate.from_messages(  # type: ignore
-            [
-                ("system", system_prompt),
-                MessagesPlaceholder(variable_name="history"),
-                ("human", "{input}"),
-            ]
-        ).partial(
-            format_instructions=PydanticOutputParser(
-                pydantic_object=CharacterResponse
-            ).get_format_instructions()
-        )
+        if self.external_id_to_llm_hash_map is None:
+            raise ValueError("External ID to LLM hash map not initialized")
+
+        # Compile the system prompt once (rendered per call in `generate_response`),
+        # split into its stable prefix and the part starting with volatile variables
+        (
+            self.render_system_prompt_prefix,
+            self.render_system_prompt_suffix,
+        ) = compile_system_prompt(system_prompt)
+
+        # Initialize conversation chain
+        self.prompt = CONVERSATION_PROMPT
 
         # Configure chains for each llm
         self.chains = {
-            llm_config_hash: (self.prompt | self.llms[llm_config_hash])
-            for llm_config_hash in self.llm_configs.keys()
+            llm_config_hash: self._get_chain(llm_config)
+            for llm_config_hash, llm_config in self.llm_configs.items()
+        }
+        self.chains_by_external_id = {
+            external_id: self.chains[llm_config_hash]
+            for external_id, llm_config_hash in self.external_id_to_llm_hash_map.items()
         }
 
     def _get_model_instance(self, config: LLMConfig) -> ChatOpenAI | ChatAnthropic:
@@ -157,6 +239,7 @@ class LLMManager:
                 model=config.model_name,
                 api_key=settings.OPENAI_API_KEY,
                 max_completion_tokens=config.max_tokens,
+                http_async_client=openai_http_client,
             )
         elif config.provider == "anthropic":
             if settings.ANTHROPIC_API_KEY is None:
@@ -176,12 +259,35 @@ class LLMManager:
         self, external_id: str, input: SystemPromptTemplateVars
     ) -> CharacterResponse:
         """Generate a response for the scene."""
-        if self.chains is None:
+        if self.chains_by_external_id is None:
             raise ValueError("Chains not initialized")
 
-        if self.external_id_to_llm_hash_map is None:
-            raise ValueError("External ID to LLM hash map not initialized")
+        if self.llm_configs_by_external_id is None:
+            raise ValueError("LLM configs not initialized")
 
-        llm_config_hash = self.external_id_to_llm_hash_map[external_id]
+        if (
+            self.render_system_prompt_prefix is None
+            or self.render_system_prompt_suffix is None
+        ):
+            raise ValueError("System prompt not initialized")
 
-        return await self.chains[llm_config_hash].ainvoke(input)
+        prefix = self.render_system_prompt_prefix(input)
+        suffix = self.render_system_prompt_suffix(input)
+        content: str | List[str | Dict] = prefix + suffix
+        if (
+            self.llm_configs_by_external_id[external_id].provider == "anthropic"
+            and prefix
+        ):
+            # Mark the stable prefix for Anthropic prompt caching (OpenAI caches
+            # identical prompt prefixes automatically)
+            blocks: List[str | Dict] = [
+                {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}
+            ]
+            if suffix:
+                blocks.append({"type": "text", "text": suffix})
+            content = blocks
+
+        system_message = SystemMessage(content=content)
+        return await self.chains_by_external_id[external_id].ainvoke(
+            {**input, "system_message": [system_message]}
+        )
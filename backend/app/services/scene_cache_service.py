@@ -0,0 +1,69 @@
+import logging
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+# Set up logger
+logger = logging.getLogger(__name__)
+
+# Cache keys
+PROPOSED_SCENES_KEY = "scenes:proposed"
+
+
+def scene_config_key(scene_config_id: int) -> str:
+    """Get the cache key of a single scene config."""
+    return f"scene:{scene_config_id}"
+
+
+class SceneCacheService:
+    """Redis-backed response cache for scene config reads.
+
+    The cache is disabled (every lookup is a miss) when `REDIS_HOST` is not
+    set. Redis errors are logged and treated as misses, so the database stays
+    the source of truth.
+    """
+
+    def __init__(self) -> None:
+        self.ttl = settings.SCENE_CACHE_TTL  # seconds
+        self.redis: Optional[Redis] = (
+            Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+            )
+            if settings.REDIS_HOST
+            else None
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a cached response body."""
+        if self.redis is None:
+            return None
+        try:
+            return await self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading cache key {key}: {e}")
+            return None
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Cache a response body."""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, value, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Error writing cache key {key}: {e}")
+
+    async def invalidate(self, *keys: str) -> None:
+        """Drop cached response bodies."""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Error invalidating cache keys {keys}: {e}")
+
+
+scene_cache = SceneCacheService()
@@ -1,12 +1,28 @@
+import asyncio
 import logging
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import UTC, datetime
 
-from sqlalchemy import select
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import (
+    JSON,
+    ColumnElement,
+    Select,
+    case,
+    cast,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import SYSTEM_PROMPT, TILE_SIZE
-from app.db.models import DBSceneConfig
+from app.core.config import settings
+from app.db.models import DBSceneConfig, DBSceneConfigVote
 from app.db.database import async_session
 from app.models.base import Position
 from app.models.scene import (
@@ -14,44 +30,139 @@ from app.models.scene import (
     CreateSceneConfig,
     SceneConfig,
     SceneConfigStatus,
+    SceneConfigSummary,
 )
 from app.default_scene import default_scene_config, default_scene_config_id
+from app.services.scene_cache_service import (
+    PROPOSED_SCENES_KEY,
+    scene_cache,
+    scene_config_key,
+)
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Validates whole listings in one call instead of one model_validate per row
+scene_config_list_adapter: TypeAdapter[List[SceneConfig]] = TypeAdapter(
+    List[SceneConfig]
+)
+
+# Columns of the scene config listings (the wide `system_prompt` column is
+# not transferred per row, the config JSON holds a copy of it)
+LISTING_COLUMNS = (
+    DBSceneConfig.id,
+    DBSceneConfig.config,
+    DBSceneConfig.votes,
+    DBSceneConfig.status,
+)
+SceneConfigListingRow = Tuple[int, Dict[str, Any], int, SceneConfigStatus]
+
+# Dialect-specific INSERT supporting ON CONFLICT DO UPDATE
+upsert_insert = pg_insert if settings.DB_TYPE == "postgresql" else sqlite_insert
+
+
+def append_comment_sql(comment: Comment) -> ColumnElement[Any]:
+    """Build the SQL expression appending a comment to a stored scene config.
+
+    The comment is appended in the database, so adding it is a single UPDATE
+    without reading (and locking) the row or rewriting the config from Python.
+    """
+    if settings.DB_TYPE == "postgresql":
+        config = cast(DBSceneConfig.config, JSONB)
+        jsonb_comments = case(
+            (func.jsonb_typeof(config["comments"]) == "array", config["comments"]),
+            else_=func.jsonb_build_array(),
+        )
+        return cast(
+            config.op("||")(
+                func.jsonb_build_object(
+                    "comments",
+                    jsonb_comments.op("||")(
+                        func.jsonb_build_array(cast(comment.model_dump(), JSONB))
+                    ),
+                )
+            ),
+            JSON,
+        )
+    json_comments = func.coalesce(
+        func.json_extract(DBSceneConfig.config, "$.comments"), "[]"
+    )
+    return func.json_set(
+        DBSceneConfig.config,
+        "$.comments",
+        func.json_insert(
+            json_comments,
+            "$[#]",
+            func.json(orjson.dumps(comment.model_dump()).decode()),
+        ),
+    )
+
 
 class SceneConfigService:
     """Service for scene config."""
 
     def __init__(self):
-        pass
+        # The default scene config is served from memory after the first read;
+        # the lock makes concurrent first reads load (or create) it only once
+        self._default_scene_config: Optional[SceneConfig] = None
+        self._default_scene_config_lock = asyncio.Lock()
+
+    async def _invalidate(self, scene_config_id: int) -> None:
+        """Drop cached reads of a scene config after it changed."""
+        default = self._default_scene_config
+        if default is not None and default.id == scene_config_id:
+            self._default_scene_config = None
+        await scene_cache.invalidate(
+            PROPOSED_SCENES_KEY, scene_config_key(scene_config_id)
+        )
+
+    def _scene_config_data(self, db_config: DBSceneConfig) -> Dict[str, Any]:
+        """Get the raw SceneConfig data of a DBSceneConfig.
+
+        The config JSON is copied rather than patched in place, so the tracked
+        `config` attribute is never modified by a read.
+        """
+        return {
+            **db_config.config,
+            "id": db_config.id,  # Not in the config json after insert
+            "system_prompt": db_config.system_prompt,
+            "votes": db_config.votes,  # Column is updated atomically
+            "status": db_config.status,  # Column is updated atomically
+        }
 
     def _convert_to_scene_config(self, db_config: DBSceneConfig) -> SceneConfig:
         """Convert a DBSceneConfig to a SceneConfig."""
-        db_config_raw = db_config.config
-        db_config_raw["id"] = (
-            db_config.id
-        )  # Patch id since it's not in the config json after insert
-        db_config_raw["system_prompt"] = (
-            db_config.system_prompt
-        )  # Patch `system_prompt`
-        scene_config = SceneConfig.model_validate(db_config_raw)
-        return scene_config
+        return SceneConfig.model_validate(self._scene_config_data(db_config))
+
+    async def _stream_scene_configs(
+        self, session: AsyncSession, stmt: Select[SceneConfigListingRow]
+    ) -> List[SceneConfig]:
+        """Stream listing rows (`select(*LISTING_COLUMNS)`) into SceneConfigs.
+
+        Rows are turned into raw config data as they arrive (no intermediate
+        list of rows) and validated in a single pass at the end. The system
+        prompt is taken from the config JSON, where it is stored on insert.
+        """
+        result = await session.stream(stmt)
+        return scene_config_list_adapter.validate_python(
+            [
+                {**row.config, "id": row.id, "votes": row.votes, "status": row.status}
+                async for row in result
+            ]
+        )
 
     async def save_scene_config(self, scene_config: CreateSceneConfig) -> SceneConfig:
         """Save the current scene config to the database."""
         try:
-            async with async_session() as session:
-                # Create new config record
+            async with async_session() as session, session.begin():
+                # Create new config record (ID is set on flush, no refresh needed)
                 db_config = DBSceneConfig(
                     config=scene_config,
                     system_prompt=SYSTEM_PROMPT,
                 )
                 session.add(db_config)
-                await session.commit()
-                await session.refresh(db_config)
-                return self._convert_to_scene_config(db_config)
+            await scene_cache.invalidate(PROPOSED_SCENES_KEY)
+            return self._convert_to_scene_config(db_config)
         except Exception as e:
             logger.error(f"Error saving scene config: {e}")
             raise e
@@ -59,15 +170,10 @@ class SceneConfigService:
     async def _get_by_id(
         self, scene_config_id: int, session: AsyncSession
     ) -> Optional[DBSceneConfig]:
-        """Get a scene config by ID using select for update."""
+        """Get a scene config by ID (read only, writes are atomic updates)."""
         try:
-            stmt = (
-                select(DBSceneConfig)
-                .where(DBSceneConfig.id == scene_config_id)
-                .with_for_update()
-            )
-            result = await session.execute(stmt)
-            return result.scalar_one_or_none()
+            # Primary key lookup, served from the identity map when possible
+            return await session.get(DBSceneConfig, scene_config_id)
         except Exception as e:
             raise Exception(
                 f"Error getting scene config {scene_config_id}: {str(e)}"
@@ -82,34 +188,79 @@ class SceneConfigService:
         return self._convert_to_scene_config(db_scene_config)
 
     async def get_all(self) -> List[SceneConfig]:
+        stmt = (
+            select(*LISTING_COLUMNS)
+            .order_by(DBSceneConfig.created_at.asc())
+            .execution_options(yield_per=100)
+        )
         try:
             async with async_session() as session:
-                result = await session.execute(
-                    select(DBSceneConfig).order_by(DBSceneConfig.created_at.asc())
-                )
-                db_scene_configs = result.scalars().all()
-                return [
-                    self._convert_to_scene_config(db_scene_config)
-                    for db_scene_config in db_scene_configs
-                ]
+                return await self._stream_scene_configs(session, stmt)
         except Exception as e:
             raise Exception(f"Error getting all scene configs: {str(e)}") from e
 
-    async def get_all_by_status(self, status: SceneConfigStatus) -> List[SceneConfig]:
+    async def get_all_by_status(
+        self,
+        status: SceneConfigStatus,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> List[SceneConfig]:
+        """Get scene configs by status, oldest first.
+
+        Args:
+            status: The status to filter by
+            limit: Maximum number of scene configs to return (all if None)
+            after_id: Only return scene configs created after this one (cursor)
+        """
+        stmt = (
+            select(*LISTING_COLUMNS)
+            .where(DBSceneConfig.status == status)
+            .order_by(DBSceneConfig.created_at.asc())
+            .limit(limit)
+            .execution_options(yield_per=100)
+        )
+        if after_id is not None:
+            stmt = stmt.where(
+                DBSceneConfig.created_at
+                > select(DBSceneConfig.created_at)
+                .where(DBSceneConfig.id == after_id)
+                .scalar_subquery()
+            )
+        try:
+            async with async_session() as session:
+                return await self._stream_scene_configs(session, stmt)
+        except Exception as e:
+            raise Exception(f"Error getting scene configs by status: {str(e)}") from e
+
+    async def get_summaries_by_status(
+        self, status: SceneConfigStatus
+    ) -> List[SceneConfigSummary]:
+        """Get scene config summaries by status without loading full configs."""
         try:
             async with async_session() as session:
                 result = await session.execute(
-                    select(DBSceneConfig)
+                    select(
+                        DBSceneConfig.id,
+                        DBSceneConfig.config["name"].as_string().label("name"),
+                        DBSceneConfig.config["proposer_name"]
+                        .as_string()
+                        .label("proposer_name"),
+                        DBSceneConfig.config["proposed_at"]
+                        .as_string()
+                        .label("proposed_at"),
+                        DBSceneConfig.votes,
+                    )
                     .where(DBSceneConfig.status == status)
-                    .order_by(DBSceneConfig.created_at.asc())
+                    .order_by(DBSceneConfig.created_at.desc())
                 )
-                db_scene_configs = result.scalars().all()
                 return [
-                    self._convert_to_scene_config(db_scene_config)
-                    for db_scene_config in db_scene_configs
+                    SceneConfigSummary.model_validate(row._mapping)
+                    for row in result.all()
                 ]
         except Exception as e:
-            raise Exception(f"Error getting scene configs by status: {str(e)}") from e
+            raise Exception(
+                f"Error getting scene config summaries by status: {str(e)}"
+            ) from e
 
     async def get_highest_voted_scene_config(self) -> Optional[SceneConfig]:
         """Get the highest voted scene config."""
@@ -119,6 +270,7 @@ class SceneConfigService:
                     select(DBSceneConfig)
                     .where(DBSceneConfig.status == SceneConfigStatus.PROPOSED)
                     .order_by(DBSceneConfig.votes.desc())
+                    .limit(1)
                 )
                 db_scene_config = result.scalar_one_or_none()
                 if db_scene_config:
@@ -132,38 +284,87 @@ class SceneConfigService:
     async def increment_votes(self, scene_config_id: int, vote: int) -> SceneConfig:
         """Increment the votes for a scene config."""
         try:
-            async with async_session() as session:
-                db_scene_config = await self._get_by_id(scene_config_id, session)
+            async with async_session() as session, session.begin():
+                # Single atomic UPDATE ... RETURNING (no read-modify-write race)
+                result = await session.execute(
+                    update(DBSceneConfig)
+                    .where(DBSceneConfig.id == scene_config_id)
+                    .values(votes=DBSceneConfig.votes + vote)
+                    .returning(DBSceneConfig)
+                )
+                db_scene_config = result.scalar_one_or_none()
                 if not db_scene_config:
                     raise Exception(f"Scene config {scene_config_id} not found")
-
-                scene_config = self._convert_to_scene_config(db_scene_config)
-                scene_config.votes = (scene_config.votes or 0) + vote
-                db_scene_config.votes = scene_config.votes
-                db_scene_config.config = scene_config.model_dump()
-                await session.commit()
-                return scene_config
+            await self._invalidate(scene_config_id)
+            return self._convert_to_scene_config(db_scene_config)
         except Exception as e:
             raise Exception(
                 f"Error incrementing votes for scene config {scene_config_id}: {str(e)}"
             ) from e
 
+    async def cast_vote(
+        self, scene_config_id: int, voter_id: str, vote: int
+    ) -> SceneConfig:
+        """Cast (or change) a voter's vote on a scene config.
+
+        Repeating the same vote is a no-op, changing it applies the difference.
+        """
+        try:
+            async with async_session() as session, session.begin():
+                # Upsert the voter's ledger entry; `previous_value` is assigned
+                # from the existing row, so the returned delta is new - old
+                insert_stmt = upsert_insert(DBSceneConfigVote).values(
+                    scene_config_id=scene_config_id,
+                    voter_id=voter_id,
+                    value=vote,
+                    previous_value=0,
+                )
+                upsert_stmt = insert_stmt.on_conflict_do_update(
+                    index_elements=["scene_config_id", "voter_id"],
+                    set_={
+                        "previous_value": DBSceneConfigVote.value,
+                        "value": insert_stmt.excluded.value,
+                    },
+                ).returning(DBSceneConfigVote.value - DBSceneConfigVote.previous_value)
+                delta = (await session.execute(upsert_stmt)).scalar_one()
+
+                # Apply the delta atomically
+                result = await session.execute(
+                    update(DBSceneConfig)
+                    .where(DBSceneConfig.id == scene_config_id)
+                    .values(votes=DBSceneConfig.votes + delta)
+                    .returning(DBSceneConfig)
+                )
+                db_scene_config = result.scalar_one_or_none()
+                if not db_scene_config:
+                    raise Exception(f"Scene config {scene_config_id} not found")
+            if delta:
+                await self._invalidate(scene_config_id)
+            return self._convert_to_scene_config(db_scene_config)
+        except Exception as e:
+            raise Exception(
+                f"Error casting vote for scene config {scene_config_id}: {str(e)}"
+            ) from e
+
     async def set_status(
         self, scene_config_id: int, status: SceneConfigStatus
     ) -> SceneConfig:
         """Set the status of a scene config."""
         try:
-            async with async_session() as session:
-                db_scene_config = await self._get_by_id(scene_config_id, session)
+            async with async_session() as session, session.begin():
+                # Single atomic UPDATE ... RETURNING of the status column (the
+                # config JSON is not rewritten, status is patched in on read)
+                result = await session.execute(
+                    update(DBSceneConfig)
+                    .where(DBSceneConfig.id == scene_config_id)
+                    .values(status=status)
+                    .returning(DBSceneConfig)
+                )
+                db_scene_config = result.scalar_one_or_none()
                 if not db_scene_config:
                     raise Exception(f"Scene config {scene_config_id} not found")
-
-                scene_config = self._convert_to_scene_config(db_scene_config)
-                scene_config.status = status
-                db_scene_config.status = scene_config.status
-                db_scene_config.config = scene_config.model_dump()
-                await session.commit()
-                return scene_config
+            await self._invalidate(scene_config_id)
+            return self._convert_to_scene_config(db_scene_config)
         except Exception as e:
             raise Exception(
                 f"Error setting status for scene config {scene_config_id}: {str(e)}"
@@ -182,23 +383,24 @@ class SceneConfigService:
     ) -> SceneConfig:
         """Add a comment to a proposed scene config."""
         try:
-            async with async_session() as session:
-                db_scene_config = await self._get_by_id(scene_config_id, session)
+            new_comment = Comment(
+                user=user,
+                comment=comment,
+                timestamp=datetime.now(UTC).isoformat(),
+            )
+            async with async_session() as session, session.begin():
+                # Single atomic UPDATE ... RETURNING appending to the comments
+                result = await session.execute(
+                    update(DBSceneConfig)
+                    .where(DBSceneConfig.id == scene_config_id)
+                    .values(config=append_comment_sql(new_comment))
+                    .returning(DBSceneConfig)
+                )
+                db_scene_config = result.scalar_one_or_none()
                 if not db_scene_config:
                     raise Exception(f"Scene config {scene_config_id} not found")
-
-                scene_config = self._convert_to_scene_config(db_scene_config)
-                scene_config.comments = scene_config.comments or []
-                scene_config.comments.append(
-                    Comment(
-                        user=user,
-                        comment=comment,
-                        timestamp=datetime.now(UTC).isoformat(),
-                    )
-                )
-                db_scene_config.config = scene_config.model_dump()
-                await session.commit()
-                return scene_config
+            await self._invalidate(scene_config_id)
+            return self._convert_to_scene_config(db_scene_config)
         except Exception as e:
             raise Exception(
                 f"Error adding comment to scene config {scene_config_id}: {str(e)}"
@@ -206,29 +408,43 @@ class SceneConfigService:
 
     async def get_default_scene_config(self) -> SceneConfig:
         """Get the default scene config."""
-        db_default = await self.get_by_id(default_scene_config_id)
-        if not db_default:
-            db_default = await self.save_scene_config(
-                default_scene_config,
-            )
-        return db_default
+        if self._default_scene_config is not None:
+            return self._default_scene_config
+        async with self._default_scene_config_lock:
+            if self._default_scene_config is not None:
+                return self._default_scene_config
+            db_default = await self.get_by_id(default_scene_config_id)
+            if not db_default:
+                db_default = await self.save_scene_config(
+                    default_scene_config,
+                )
+            self._default_scene_config = db_default
+            return db_default
+
+    async def get_proposals(
+        self, limit: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[SceneConfig]:
+        """Get proposed scene configs, oldest first."""
+        return await self.get_all_by_status(
+            SceneConfigStatus.PROPOSED, limit=limit, after_id=after_id
+        )
 
-    async def get_proposals(self) -> List[SceneConfig]:
-        """Get all proposed scene configs."""
-        return await self.get_all_by_status(SceneConfigStatus.PROPOSED)
+    async def get_proposal_summaries(self) -> List[SceneConfigSummary]:
+        """Get summaries of all proposed scene configs."""
+        return await self.get_summaries_by_status(SceneConfigStatus.PROPOSED)
 
     async def create_scene_config_proposal(
         self, scene_config: CreateSceneConfig
     ) -> SceneConfig:
         """Propose a new scene."""
-        # Set default positions for characters if not provided
-        for i, (_, char) in enumerate(scene_config.characters_config.items()):
+        # Set default positions for characters if not provided, in a line
+        # formation starting at x=7.5 tiles (1 tile apart), centered vertically.
+        # The coordinates are known to be valid, so validation is skipped.
+        default_y = TILE_SIZE * 7.5
+        for i, char in enumerate(scene_config.characters_config.values()):
             if not char.initial_position:
-                # Default to a line formation
-                char.initial_position = Position(
-                    x=TILE_SIZE
-                    * (7.5 + i),  # Start at x=7.5 tiles, increment by 1 tile
-                    y=TILE_SIZE * 7.5,  # Center vertically
+                char.initial_position = Position.model_construct(
+                    x=TILE_SIZE * (7.5 + i), y=default_y
                 )
 
         scene_config.proposed_at = datetime.now(UTC).isoformat()
@@ -236,3 +452,9 @@ class SceneConfigService:
 
         # Save to database
         return await self.save_scene_config(scene_config)
+
+
+@lru_cache(maxsize=1)
+def get_scene_config_service() -> SceneConfigService:
+    """Get the shared scene config service (FastAPI dependency)."""
+    return SceneConfigService()
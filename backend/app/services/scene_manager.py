@@ -1,25 +1,34 @@
-from typing import Set, Optional
+from typing import TYPE_CHECKING, Dict, Set, Optional, Tuple
 import time
 import logging
 import random
 import asyncio
-from socket import SocketIO
 
-from app.services.conversation_manager import ConversationManager, Message
-from app.services.scene_config_service import SceneConfigService
+import orjson
+
+from app.services.conversation_manager import ConversationManager
+from app.services.scene_config_service import get_scene_config_service
 from app.services.scene_service import SceneService
 from app.services.scene_state_snapshot_service import SceneStateSnapshotService
-from app.services.llm_manager import LLMManager
-from app.models.character import CharacterAction
+from app.services.llm_manager import CharacterResponse, LLMManager
+from app.utils.scene_state_patch import SceneStateDict, make_scene_state_patch
+from app.models.character import CharacterAction, CharacterState
+from app.models.conversation import Message
 from app.models.scene import (
     Scene,
     SceneConfig,
     SceneState,
 )
 
+if TYPE_CHECKING:
+    from socketio import AsyncServer
+
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Socket.IO room of the visitors of the active scene
+SCENE_ROOM = "scene"
+
 
 class SceneManager:
     """Scene manager."""
@@ -30,20 +39,45 @@ class SceneManager:
         # Configs
         self.base_pause_time = 5.0  # Base pause time for engagement (between speaking and thinking), in seconds
         self.new_conversation_cooldown = 600.0  # 10 minutes in seconds
+        self.broadcast_interval = 0.05  # Coalescing window for broadcasts, in seconds
+        self.snapshot_interval = 1.0  # Coalescing window for snapshots, in seconds
+        self.message_retention = 100  # Messages kept in the scene state
 
         # Scene incl state and config
         self.scene: Scene | None = None  # active scene
         self.scene_service = SceneService()
-        self.scene_config_service = SceneConfigService()
+        self.scene_config_service = get_scene_config_service()
         self.scene_state_snapshot_service = SceneStateSnapshotService()
         self.llm_manager = LLMManager()
         self.conversation_manager = ConversationManager(self.llm_manager)
 
         # Internal states
         self.active_visitors: Set[str] = set()
+        # The other characters of each character of the active scene
+        self._other_characters: Dict[str, Tuple[str, ...]] = {}
+        # Monotonic clock readings of `action_started_at` per character, for
+        # duration math that is immune to wall clock adjustments
+        self._action_started_monotonic: Dict[str, float] = {}
+        # Number of characters with an end conversation request
+        self._pending_end_requests = 0
+        self._broadcast_pending = asyncio.Event()
+        self._broadcast_task: Optional[asyncio.Task[None]] = None
+        self._snapshot_pending = asyncio.Event()
+        # Notified when visitors join or leave (wakes the paused conversation)
+        self._activity = asyncio.Condition()
+        self._snapshot_task: Optional[asyncio.Task[None]] = None
+        self._last_broadcast_state: Optional[SceneStateDict] = None
+        # `_last_broadcast_state` encoded for initial syncs (reset per broadcast)
+        self._last_broadcast_json: Optional[orjson.Fragment] = None
+        # Response of the next turn (speaker, recipient, LLM task), generated
+        # while the current speaker is still speaking
+        self._prefetched_response: Optional[
+            Tuple[str, str, asyncio.Task[CharacterResponse]]
+        ] = None
 
         # Technical
-        self.sio: Optional[SocketIO] = None  # Will be set by the socket manager
+        self.sio: Optional["AsyncServer"] = None  # Will be set by the socket manager
+        self._sio_ready = asyncio.Event()  # Set once `sio` is set
 
         # Start the conversation loop
         asyncio.create_task(self._load_and_run())
@@ -64,12 +98,14 @@ class SceneManager:
         if not snapshot:
             return None
         self.scene = snapshot
+        self._init_scene_tracking()
         # load conversation from snapshot
         self.conversation_manager.init_conversation(snapshot.state.messages)
         return self.scene.state
 
     async def load_new_scene(self, scene_config_id: int | None = None) -> None:
         """Load a new scene."""
+        self._cancel_prefetched_response()
         scene_config: SceneConfig | None = None
         if scene_config_id is None:
             scene_config = await self.get_next_scene_config()
@@ -80,14 +116,13 @@ class SceneManager:
         self.scene = await self.scene_service.create_scene(
             scene_config, len(self.active_visitors)
         )
+        self._init_scene_tracking()
         self.conversation_manager.init_conversation()
-        await self.scene_state_snapshot_service.create_snapshot(self.scene.state)
 
     async def _load_and_run(self) -> None:
         """Initialize the scene manager."""
         # Wait for self.sio to be set
-        while self.sio is None:
-            await asyncio.sleep(1)
+        await self._sio_ready.wait()
 
         # Load latest scene state snapshot
         latest_snapshot = await self._load_latest_scene_state_snapshot()
@@ -100,22 +135,104 @@ class SceneManager:
         # Initialize LLMs for the scene
         self.llm_manager.init_scene(self.scene.config)
 
+        # Start the broadcast and snapshot loops
+        self._broadcast_task = asyncio.create_task(self._broadcast_loop())
+        self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+
         # Start the conversation loop
         asyncio.create_task(self._conversation_loop())
 
-    async def set_socket_instance(self, sio: SocketIO) -> None:
+    async def set_socket_instance(self, sio: "AsyncServer") -> None:
         """Set the socket instance for emitting updates."""
         self.sio = sio
+        self._sio_ready.set()
 
     async def emit_scene_update(
         self, sid: Optional[str] = None, save_snapshot: bool = True
     ) -> None:
-        """Emit scene state update to all connected visitors."""
+        """Emit scene state update to all connected visitors.
+
+        Updates for a single visitor are sent immediately. Broadcasts and
+        snapshots are coalesced by `_broadcast_loop` and `_snapshot_loop`, so a
+        burst of state changes results in one emit and one snapshot write of
+        the latest state.
+        """
         state = self.get_scene_state()
         if save_snapshot:
-            await self.scene_state_snapshot_service.create_snapshot(state)
-        if self.sio:
-            await self.sio.emit("scene_state", state.model_dump(), room=sid)  # type: ignore
+            self._snapshot_pending.set()
+        if sid is None:
+            self._broadcast_pending.set()
+        elif self.sio:
+            # The visitor gets the last broadcast state, which the next
+            # broadcast's patch brings up to date. The visitor is connected to
+            # this server, so the message bypasses the client manager's queue
+            self._broadcast_pending.set()
+            await self.sio.emit(
+                "scene_state",
+                self._get_initial_scene_state(state),
+                room=sid,
+                ignore_queue=True,
+            )
+
+    def _get_initial_scene_state(self, state: SceneState) -> orjson.Fragment:
+        """Get the serialized scene state for a visitor's initial sync.
+
+        The last broadcast state is encoded once and reused for all visitors
+        joining until the next broadcast. The current state is serialized
+        (by pydantic-core) if the scene was not broadcast yet. Either way, the
+        JSON is embedded as-is by the orjson-backed Socket.IO encoder.
+        """
+        last_state = self._last_broadcast_state
+        if last_state is None or last_state["scene_id"] != state.scene_id:
+            return orjson.Fragment(state.model_dump_json())
+        if self._last_broadcast_json is None:
+            self._last_broadcast_json = orjson.Fragment(orjson.dumps(last_state))
+        return self._last_broadcast_json
+
+    async def _broadcast_loop(self) -> None:
+        """Broadcast the latest scene state at most once per broadcast interval.
+
+        The full state is broadcast for a new scene; afterwards only a patch
+        against the previous broadcast is sent (visitors get the full state
+        when they connect).
+        """
+        while True:
+            await self._broadcast_pending.wait()
+            # Collect further updates within the coalescing window
+            await asyncio.sleep(self.broadcast_interval)
+            self._broadcast_pending.clear()
+            try:
+                if self.sio and self.scene:
+                    await self._broadcast_scene_state(self.scene.state.model_dump())
+            except Exception as e:
+                logger.error(f"Error broadcasting scene state: {e}")
+
+    async def _snapshot_loop(self) -> None:
+        """Save a snapshot of the latest scene state at most once per interval."""
+        while True:
+            await self._snapshot_pending.wait()
+            # Collect further updates within the coalescing window
+            await asyncio.sleep(self.snapshot_interval)
+            self._snapshot_pending.clear()
+            try:
+                if self.scene:
+                    await self.scene_state_snapshot_service.create_snapshot(
+                        self.scene.state
+                    )
+            except Exception as e:
+                logger.error(f"Error saving scene state snapshot: {e}")
+
+    async def _broadcast_scene_state(self, state: SceneStateDict) -> None:
+        """Broadcast the scene state, as a patch if possible."""
+        previous = self._last_broadcast_state
+        if previous is None or previous["scene_id"] != state["scene_id"]:
+            await self.sio.emit("scene_state", state, room=SCENE_ROOM)  # type: ignore
+        else:
+            patch = make_scene_state_patch(previous, state)
+            if patch is not None:
+                await self.sio.emit("scene_state_patch", patch, room=SCENE_ROOM)  # type: ignore
+        self._last_broadcast_state = state
+        self._last_broadcast_json = None
 
     def get_scene_state(self) -> SceneState:
         """Get the current state of the scene."""
@@ -136,10 +253,14 @@ class SceneManager:
             sid: The socket ID of the visitor
         """
         self.active_visitors.add(sid)
+        if self.sio:
+            # Left automatically when the client disconnects
+            await self.sio.enter_room(sid, SCENE_ROOM)
         if self.scene:
             self.scene.state = self._set_visitors(
                 len(self.active_visitors), self.scene.state
             )
+            await self._notify_activity()
             await self.emit_scene_update(sid)
 
     async def remove_visitor(self, sid: str) -> None:
@@ -149,35 +270,89 @@ class SceneManager:
             self.scene.state = self._set_visitors(
                 len(self.active_visitors), self.scene.state
             )
-            await self.emit_scene_update(sid)
+            await self._notify_activity()
+            # The visitor is gone (and left the room); update the others
+            await self.emit_scene_update()
 
-    def _get_other_character(self, characterId: str) -> str:
-        """Get another random character."""
+    async def _notify_activity(self) -> None:
+        """Wake the conversation loop if it is waiting for activity."""
+        async with self._activity:
+            self._activity.notify_all()
+
+    async def _wait_for_activity(self) -> None:
+        """Wait until the paused conversation can continue.
+
+        An ended conversation is waited on until its cooldown expires (a new
+        one is started then), an inactive one until visitors joined.
+        """
         if self.scene is None:
             raise ValueError("Scene not found")
-        char_ids = list(
-            filter(
-                lambda char_id: char_id != characterId,
-                self.scene.state.characters.keys(),
+        state = self.scene.state
+        timeout = None
+        if state.conversation_ended:
+            timeout = max(
+                0.0,
+                (state.ended_at or 0) + self.new_conversation_cooldown - time.time(),
             )
+        async with self._activity:
+            try:
+                await asyncio.wait_for(
+                    self._activity.wait_for(
+                        lambda: state.conversation_active
+                        and not state.conversation_ended
+                    ),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def _init_scene_tracking(self) -> None:
+        """Initialize the bookkeeping derived from the loaded scene."""
+        if self.scene is None:
+            raise ValueError("Scene not found")
+        self._init_other_characters()
+        self._action_started_monotonic.clear()
+        self._pending_end_requests = sum(
+            character.end_conversation_requested
+            for character in self.scene.state.characters.values()
         )
-        return random.choice(char_ids)
+
+    def _init_other_characters(self) -> None:
+        """Map each character of the scene to the other characters."""
+        if self.scene is None:
+            raise ValueError("Scene not found")
+        char_ids = tuple(self.scene.state.characters.keys())
+        self._other_characters = {
+            char_id: tuple(other for other in char_ids if other != char_id)
+            for char_id in char_ids
+        }
+
+    def _get_other_character(self, characterId: str) -> str:
+        """Get another random character."""
+        others = self._other_characters[characterId]
+        # Two-character scenes (the common case) need no random pick
+        return others[0] if len(others) == 1 else random.choice(others)
 
     async def _set_character_action(
         self,
         characterId: str,
         action: CharacterAction,
         estimated_duration: Optional[float] = None,
+        save_snapshot: bool = False,
     ) -> None:
-        """Set the action of a character."""
+        """Set the action of a character.
+
+        Intermediate actions ("thinking", "idle") are only broadcast by
+        default; the turn is persisted once the message is spoken.
+        """
         if self.scene is None:
             raise ValueError("Scene not found")
-        self.scene.state.characters[characterId].action = action
-        self.scene.state.characters[characterId].action_started_at = time.time()
-        self.scene.state.characters[characterId].action_estimated_duration = (
-            estimated_duration
-        )
-        await self.emit_scene_update()
+        character = self.scene.state.characters[characterId]
+        character.action = action
+        character.action_started_at = time.time()
+        self._action_started_monotonic[characterId] = time.monotonic()
+        character.action_estimated_duration = estimated_duration
+        await self.emit_scene_update(save_snapshot=save_snapshot)
 
     async def _set_character_speaking(
         self, characterId: str, recipient: Optional[str] = None
@@ -188,22 +363,37 @@ class SceneManager:
 
         message = await self._generate_message(characterId, recipient)
 
-        self.scene.state.characters[characterId].action = "speaking"
-        self.scene.state.characters[characterId].action_started_at = (
-            message.unix_timestamp
-        )
-        self.scene.state.characters[characterId].action_estimated_duration = (
-            message.calculated_speaking_time
-        )
+        character = self.scene.state.characters[characterId]
+        character.action = "speaking"
+        character.action_started_at = message.unix_timestamp
+        self._action_started_monotonic[characterId] = time.monotonic()
+        character.action_estimated_duration = message.calculated_speaking_time
 
-        self.scene.state.messages.append(message)  ## TODO use conversation manager
+        self._append_message(message)
+        self.conversation_manager.add_message(message)
+        self._prefetch_next_response()
 
-        # Emit update to all visitors
-        await self.emit_scene_update()
+        # Emit update to all visitors and persist the turn
+        await self.emit_scene_update(save_snapshot=True)
 
         # Simulate speaking pause
         await asyncio.sleep(message.calculated_speaking_time)
 
+    def _append_message(self, message: Message) -> None:
+        """Append a message to the scene state, trimming the oldest messages.
+
+        Trimmed messages stay in the earlier snapshots; only the most recent
+        ones are kept in memory, broadcast to new visitors and snapshotted.
+        """
+        if self.scene is None:
+            raise ValueError("Scene not found")
+        state = self.scene.state
+        state.messages.append(message)
+        excess = len(state.messages) - self.message_retention
+        if excess > 0:
+            del state.messages[:excess]
+            state.messages_offset += excess
+
     async def _generate_message(
         self, characterId: str, recipient: Optional[str] = None
     ) -> Message:
@@ -214,34 +404,84 @@ class SceneManager:
         # Set character to thinking
         await self._set_character_action(characterId, "thinking")
 
-        # Generate message
-        message = await self.conversation_manager.generate_message(
-            self.scene, characterId, recipient
-        )
+        # Generate message (the response is usually prefetched already)
+        response_task = self._take_prefetched_response(characterId, recipient)
+        if response_task is not None:
+            response = await response_task
+        else:
+            response = await self.conversation_manager.generate_response(
+                self.scene, characterId, recipient
+            )
+        message = self.conversation_manager.create_message(characterId, response)
 
         # Update character's mood
-        self.scene.state.characters[characterId].current_mood = message.mood
+        character = self.scene.state.characters[characterId]
+        character.current_mood = message.mood
 
-        # Update character's end conversation request
+        # Update character's end conversation request (requested when the
+        # message was created, so its timestamp is reused)
         end_conversation = message.end_conversation
         if end_conversation:
-            self.scene.state.characters[characterId].end_conversation_requested = (
-                end_conversation
-            )
-            self.scene.state.characters[characterId].end_conversation_requested_at = (
-                time.time()
-            )
-            self.scene.state.characters[
-                characterId
-            ].end_conversation_requested_validity_duration = (
+            if not character.end_conversation_requested:
+                self._pending_end_requests += 1
+            character.end_conversation_requested = end_conversation
+            character.end_conversation_requested_at = message.unix_timestamp
+            character.end_conversation_requested_validity_duration = (
                 self.conversation_manager.get_end_conversation_request_validity()
             )
 
-        # Simulate speaking pause
-        await asyncio.sleep(message.calculated_speaking_time)
-
         return message
 
+    def _prefetch_next_response(self) -> None:
+        """Start generating the next turn's response in the background.
+
+        The LLM request then overlaps with the current speaker's speaking and
+        pause time instead of following it.
+        """
+        if self.scene is None or self.scene.state.conversation_ended:
+            return
+        self._cancel_prefetched_response()
+        next_speaker = self._get_next_speaker()
+        recipient = self._get_other_character(next_speaker)
+        self._prefetched_response = (
+            next_speaker,
+            recipient,
+            asyncio.create_task(
+                self.conversation_manager.generate_response(
+                    self.scene, next_speaker, recipient
+                )
+            ),
+        )
+
+    def _take_prefetched_response(
+        self, characterId: str, recipient: Optional[str]
+    ) -> Optional[asyncio.Task[CharacterResponse]]:
+        """Take the prefetched response task if it is for the given turn."""
+        if self._prefetched_response is None:
+            return None
+        next_speaker, next_recipient, task = self._prefetched_response
+        if (next_speaker, next_recipient) != (characterId, recipient):
+            self._cancel_prefetched_response()
+            return None
+        self._prefetched_response = None
+        return task
+
+    def _cancel_prefetched_response(self) -> None:
+        """Drop the prefetched response (if any)."""
+        if self._prefetched_response is None:
+            return
+        task = self._prefetched_response[2]
+        self._prefetched_response = None
+        if not task.cancel() and not task.cancelled():
+            task.exception()  # Mark a failed prefetch as retrieved
+
+    def _get_next_turn(self) -> Tuple[str, str]:
+        """Get the next speaker and recipient (those of the prefetched response)."""
+        if self._prefetched_response is not None:
+            return self._prefetched_response[0], self._prefetched_response[1]
+        next_speaker = self._get_next_speaker()
+        return next_speaker, self._get_other_character(next_speaker)
+
     def _get_next_speaker(self) -> str:
         """Determine the next speaker based on conversation state."""
         if self.scene is None:
@@ -280,8 +520,7 @@ class SceneManager:
                     await self._wait_until_all_characters_completed_speaking()
 
                     # Get next speaker to start new message
-                    next_speaker = self._get_next_speaker()
-                    recipient = self._get_other_character(next_speaker)
+                    next_speaker, recipient = self._get_next_turn()
                     await self._set_character_speaking(next_speaker, recipient)
 
                     # Handle end conversation requests
@@ -294,57 +533,83 @@ class SceneManager:
                     logger.error(f"Error in conversation loop: {e}")
                     await asyncio.sleep(5)
             else:
-                # Conversation paused, check every second
-                await asyncio.sleep(1)
+                # Conversation paused (a prefetched response would be stale by
+                # the time it resumes)
+                self._cancel_prefetched_response()
+                await self._wait_for_activity()
 
     async def _wait_until_all_characters_completed_speaking(self):
         """Wait until all characters completed speaking."""
         # "Speaking Loop": Wait until all characters completed speaking
         # logger.info(f"[{current_time}]: Speaking loop started")
-        # loop through all characters and check if they have completed speaking
+        # wait for all speaking characters in parallel
         if self.scene is None:
             raise ValueError("Scene not found")
-        for charId, character in self.scene.state.characters.items():
-            if character.action != "speaking":
-                continue
-
-            current_time = time.time()
-            logger.info(f"[{current_time}]: Speaking character: {charId}")
-            if (
-                character.action_estimated_duration is not None
-                and current_time - character.action_started_at
-                < character.action_estimated_duration
-            ):
-                # Wait until the character has completed speaking
-                await asyncio.sleep(
-                    character.action_estimated_duration
-                    - (current_time - character.action_started_at)
-                )
+        speaking = [
+            (charId, character)
+            for charId, character in self.scene.state.characters.items()
+            if character.action == "speaking"
+        ]
+        if not speaking:
+            return
+        await asyncio.gather(
+            *(
+                self._wait_until_completed_speaking(charId, character)
+                for charId, character in speaking
+            )
+        )
 
-            # Set the character action to idle
-            await self._set_character_action(charId, "idle")
+        # Pause time for engagement after speaking (once per turn)
+        await asyncio.sleep(self.base_pause_time)
 
-            # Pause time for engagement after speaking
-            await asyncio.sleep(self.base_pause_time)
+    async def _wait_until_completed_speaking(
+        self, charId: str, character: CharacterState
+    ) -> None:
+        """Wait until a speaking character completed speaking, then set it idle."""
+        logger.info(f"[{time.time()}]: Speaking character: {charId}")
+        elapsed = self._get_action_elapsed(charId, character)
+        if (
+            character.action_estimated_duration is not None
+            and elapsed < character.action_estimated_duration
+        ):
+            # Wait until the character has completed speaking
+            await asyncio.sleep(character.action_estimated_duration - elapsed)
+
+        # Set the character action to idle
+        await self._set_character_action(charId, "idle")
+
+    def _get_action_elapsed(self, charId: str, character: CharacterState) -> float:
+        """Get the seconds since the character's current action started.
+
+        Falls back to the wall clock for actions restored from a snapshot.
+        """
+        started_at = self._action_started_monotonic.get(charId)
+        if started_at is None:
+            return time.time() - character.action_started_at
+        return time.monotonic() - started_at
 
     async def _handle_end_conversation_requests(self):
         """Handle end conversation requests."""
+        if self.scene is None:
+            raise ValueError("Scene not found")
+        if self._pending_end_requests == 0:
+            # Nothing to expire, and nobody agreed to end
+            return
         current_time = time.time()
+        validity = self.conversation_manager.get_end_conversation_request_validity()
         all_characters_agreed_to_end = True
         is_changed = False
-        if self.scene is None:
-            raise ValueError("Scene not found")
         for _charId, character in self.scene.state.characters.items():
             if (
                 character.end_conversation_requested
                 and character.end_conversation_requested_at is not None
-                and current_time - character.end_conversation_requested_at
-                > self.conversation_manager.get_end_conversation_request_validity()
+                and current_time - character.end_conversation_requested_at > validity
             ):
                 # clean expired end conversation requests
                 character.end_conversation_requested = False
                 character.end_conversation_requested_at = None
                 character.end_conversation_requested_validity_duration = None
+                self._pending_end_requests -= 1
                 is_changed = True
             if not character.end_conversation_requested:
                 all_characters_agreed_to_end = False
@@ -353,6 +618,7 @@ class SceneManager:
             self.scene.state.conversation_ended = True
             self.scene.state.ended_at = time.time()
             is_changed = True
+            self._cancel_prefetched_response()
             logger.info("All characters agreed to end conversation")
         # Emit update if state changed
         if is_changed:
@@ -3,7 +3,7 @@ import time
 from typing import Dict
 
 from app.db.database import async_session
-from app.db.models import DBScene
+from app.db.models import DBScene, DBSceneStateSnapshot
 from app.models.character import CharacterConfig, CharacterState
 from app.models.scene import Scene, SceneConfig, SceneState
 
@@ -21,8 +21,9 @@ class SceneService:
         self, characters_config: Dict[str, CharacterConfig], started_at: float
     ) -> Dict[str, CharacterState]:
         """Initialize characters from `characters` dict with more detailed context"""
+        # Fields come from an already validated `CharacterConfig`, skip re-validation
         return {
-            char_id: CharacterState(
+            char_id: CharacterState.model_construct(
                 id=char_config.id,
                 name=char_config.name,
                 color=char_config.color,
@@ -44,7 +45,7 @@ class SceneService:
         """Initialize the scene."""
         logger.info("Initializing scene")
         started_at = time.time()
-        return SceneState(
+        return SceneState.model_construct(
             scene_id=scene_id,
             scene_config_id=scene_config.id,
             characters=self._initialize_characters_state(
@@ -60,16 +61,15 @@ class SceneService:
     async def create_scene(
         self, scene_config: SceneConfig, current_visitor_count: int
     ) -> Scene:
-        """Create a new scene."""
+        """Create a new scene and persist its initial state snapshot."""
         try:
-            async with async_session() as session:
-                # Create new scene record
+            async with async_session() as session, session.begin():
+                # Create new scene record (flush to get its ID)
                 db_scene = DBScene(
                     config_id=scene_config.id,
                 )
                 session.add(db_scene)
-                await session.commit()
-                await session.refresh(db_scene)
+                await session.flush()
 
                 scene = Scene(
                     id=db_scene.id,
@@ -79,7 +79,10 @@ class SceneService:
                     ),
                 )
 
-                return scene
+                # Initial snapshot is written in the same transaction
+                session.add(DBSceneStateSnapshot(state=scene.state))
+
+            return scene
         except Exception as e:
             logger.error(f"Error saving scene: {e}")
             raise e
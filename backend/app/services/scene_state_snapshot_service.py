@@ -1,10 +1,14 @@
+import asyncio
 import logging
+import time
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+import orjson
 
-from app.db.models import DBSceneStateSnapshot
-from app.db.database import async_session
+from sqlalchemy import insert, select
+from sqlalchemy.orm import joinedload, load_only
+
+from app.db.models import DBSceneConfig, DBSceneStateSnapshot
+from app.db.database import async_session, engine
 from app.models.scene import Scene, SceneConfig, SceneState
 
 # Set up logger
@@ -15,18 +19,31 @@ class SceneStateSnapshotService:
     """Service for scene state snapshot."""
 
     def __init__(self):
-        pass
+        # Serialized state of the last snapshot written by this service
+        self._last_snapshot_json: str | None = None
 
     async def create_snapshot(self, state: SceneState) -> None:
-        """Create a snapshot of the scene state."""
+        """Create a snapshot of the scene state.
+
+        Nothing is written if the state is identical to the last snapshot.
+        """
         try:
-            async with async_session() as session:
-                # Create new snapshot
-                snapshot = DBSceneStateSnapshot(
-                    state=state,
+            state_json = state.model_dump_json()
+            if state_json == self._last_snapshot_json:
+                return
+            # Plain insert on a pooled connection (no session), with the state
+            # serialized by Pydantic and embedded by the orjson column
+            # serializer as is
+            async with engine.begin() as connection:
+                await connection.execute(
+                    insert(DBSceneStateSnapshot).values(
+                        timestamp=time.time(),
+                        state=orjson.Fragment(state_json),
+                        scene_id=state.scene_id,
+                        config_id=state.scene_config_id,
+                    )
                 )
-                session.add(snapshot)
-                await session.commit()
+            self._last_snapshot_json = state_json
         except Exception as e:
             raise Exception(f"Error saving state snapshot: {str(e)}")
 
@@ -34,10 +51,23 @@ class SceneStateSnapshotService:
         """Get the latest snapshot of the scene state."""
         try:
             async with async_session() as session:
-                # Query for latest state snapshot with eager loading of config
+                # Query for latest state snapshot with eager loading of config,
+                # loading only the columns used to restore the scene. A join
+                # (not `selectinload`) since it's a single row: one round-trip
                 query = (
                     select(DBSceneStateSnapshot)
-                    .options(selectinload(DBSceneStateSnapshot.config))
+                    .options(
+                        load_only(
+                            DBSceneStateSnapshot.scene_id,
+                            DBSceneStateSnapshot.config_id,
+                            DBSceneStateSnapshot.state,
+                        ),
+                        joinedload(DBSceneStateSnapshot.config).load_only(
+                            DBSceneConfig.config,
+                            DBSceneConfig.votes,
+                            DBSceneConfig.status,
+                        ),
+                    )
                     .order_by(DBSceneStateSnapshot.timestamp.desc())
                     .limit(1)
                 )
@@ -52,8 +82,20 @@ class SceneStateSnapshotService:
         snapshot = await self._get_latest_snapshot()
         if not snapshot:
             return None
-        return Scene(
-            id=snapshot.scene_id,
-            config=SceneConfig.model_validate(snapshot.config.config),
-            state=SceneState.model_validate(snapshot.state),
+        # Validate the (potentially large) JSON blobs in a worker thread to
+        # keep the event loop responsive
+        config, state = await asyncio.gather(
+            asyncio.to_thread(
+                SceneConfig.model_validate,
+                # Patch id since it's not in the config json after insert, and
+                # the atomically updated columns
+                {
+                    **snapshot.config.config,
+                    "id": snapshot.config.id,
+                    "votes": snapshot.config.votes,
+                    "status": snapshot.config.status,
+                },
+            ),
+            asyncio.to_thread(SceneState.model_validate, snapshot.state),
         )
+        return Scene(id=snapshot.scene_id, config=config, state=state)
@@ -23,31 +23,43 @@ def format_validation_errors(error: ValidationError) -> List[ErrorDict]:
     Returns:
         A list of formatted error dictionaries with field, message, and context
     """
-    formatted_errors: List[ErrorDict] = []
-
-    # Log the full error for debugging
-    logger.error(f"Validation Error: {str(error)}")
-    logger.error(f"Error details: {error.errors()}")
-
-    for err in error.errors():
-        # Create a readable location string
-        location = " -> ".join(str(loc) for loc in err["loc"])
-
-        # Format the error details with proper typing
-        error_details: ErrorDict = {
-            "field": location,
+    return [
+        {
+            # Readable location string
+            "field": " -> ".join(map(str, err["loc"])),
             "message": err["msg"],
             "type": err["type"],
             "context": err.get("ctx", {}),
             "input": err.get("input", None),
         }
+        for err in error.errors()
+    ]
 
-        # Log each individual error
-        logger.error(
-            f"Validation error in field '{location}': {err['msg']} "
-            f"(type: {err['type']}, input: {err.get('input', 'None')})"
-        )
 
-        formatted_errors.append(error_details)
+def format_and_log_validation_errors(error: ValidationError) -> List[ErrorDict]:
+    """Format validation errors (see `format_validation_errors`) and log them.
+
+    Args:
+        error: The ValidationError from pydantic
+
+    Returns:
+        A list of formatted error dictionaries with field, message, and context
+    """
+    formatted_errors = format_validation_errors(error)
+
+    if logger.isEnabledFor(logging.ERROR):
+        # Log the full error for debugging
+        logger.error("Validation Error: %s", error)
+        logger.error("Error details: %s", error.errors())
+
+        # Log each individual error
+        for error_details in formatted_errors:
+            logger.error(
+                "Validation error in field '%s': %s (type: %s, input: %s)",
+                error_details["field"],
+                error_details["message"],
+                error_details["type"],
+                error_details["input"],
+            )
 
     return formatted_errors
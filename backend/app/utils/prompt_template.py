@@ -0,0 +1,65 @@
+from string import Formatter
+from typing import Any, Callable, Collection, Mapping, Tuple
+
+PromptRenderer = Callable[[Mapping[str, Any]], str]
+
+
+def compile_prompt_template(template: str) -> PromptRenderer:
+    """Compile an f-string style prompt template into a render function.
+
+    The template is parsed once into an equivalent `%`-style mapping format,
+    so rendering is a single C-level formatting pass instead of re-parsing
+    the `{...}` placeholders on every call.
+
+    Args:
+        template: Prompt template with `{name}` placeholders (`{{`/`}}` escapes)
+
+    Returns:
+        A function rendering the template from a mapping of variables
+    """
+    parts: list[str] = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace("%", "%%"))
+        if field_name is None:
+            continue
+        if not field_name.isidentifier() or format_spec or conversion:
+            raise ValueError(f"Unsupported prompt template placeholder: {field_name}")
+        parts.append(f"%({field_name})s")
+    compiled = "".join(parts)
+
+    def render(variables: Mapping[str, Any]) -> str:
+        return compiled % variables
+
+    return render
+
+
+def split_prompt_template(
+    template: str, volatile_fields: Collection[str]
+) -> Tuple[str, str]:
+    """Split a prompt template before its first volatile placeholder.
+
+    The prefix renders identically across calls as long as the non-volatile
+    variables do not change, which makes it usable as a provider-side prompt
+    cache prefix. Rendering both parts and concatenating them equals rendering
+    the whole template.
+
+    Args:
+        template: Prompt template with `{name}` placeholders (`{{`/`}}` escapes)
+        volatile_fields: Names of the variables that change between calls
+
+    Returns:
+        The template prefix and the remaining template (either may be empty)
+    """
+    prefix: list[str] = []
+    suffix: list[str] = []
+    parts = prefix
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field_name is None:
+            continue
+        if field_name in volatile_fields:
+            parts = suffix
+        conversion = f"!{conversion}" if conversion else ""
+        format_spec = f":{format_spec}" if format_spec else ""
+        parts.append(f"{{{field_name}{conversion}{format_spec}}}")
+    return "".join(prefix), "".join(suffix)
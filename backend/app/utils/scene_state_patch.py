@@ -0,0 +1,56 @@
+from typing import Any, Dict, Optional
+
+SceneStateDict = Dict[str, Any]
+
+
+def make_scene_state_patch(
+    previous: SceneStateDict, current: SceneStateDict
+) -> Optional[SceneStateDict]:
+    """Make a patch turning a dumped scene state into another one of the same scene.
+
+    The patch holds the changed top-level fields. Characters are patched per
+    character (changed characters are sent whole), and messages are sent from
+    `messages_from` on, replacing the receiver's messages from that index.
+    Message indices count from the start of the conversation, i.e. include the
+    messages trimmed from the front (`messages_offset`). All parts are
+    idempotent, so a patch can be applied on top of any newer state.
+
+    Args:
+        previous: The previously broadcast scene state (`SceneState.model_dump()`)
+        current: The current scene state (`SceneState.model_dump()`)
+
+    Returns:
+        The patch (always including `scene_id`), or None if nothing changed
+    """
+    patch: SceneStateDict = {}
+    for key, value in current.items():
+        if key == "characters":
+            previous_characters = previous["characters"]
+            characters = {
+                char_id: character
+                for char_id, character in value.items()
+                if previous_characters.get(char_id) != character
+            }
+            if characters:
+                patch["characters"] = characters
+        elif key == "messages":
+            previous_messages = previous["messages"]
+            offset = current.get("messages_offset", 0)
+            previous_end = previous.get("messages_offset", 0) + len(previous_messages)
+            # Messages are append-only (trimmed from the front); anything else
+            # is sent in full
+            last = previous_end - 1 - offset  # previous last message in `value`
+            appended = offset + len(value) >= previous_end and (
+                not previous_messages
+                or (last >= 0 and value[last] == previous_messages[-1])
+            )
+            messages_from = max(previous_end, offset) if appended else offset
+            if not appended or messages_from < offset + len(value):
+                patch["messages_from"] = messages_from
+                patch["messages"] = value[messages_from - offset :]
+        elif previous.get(key) != value:
+            patch[key] = value
+    if not patch:
+        return None
+    patch["scene_id"] = current["scene_id"]
+    return patch
@@ -0,0 +1,21 @@
+"""orjson-backed JSON module for the Socket.IO server.
+
+python-socketio calls `json.dumps(data, separators=(",", ":"))` and expects a
+`str` back, so this wraps orjson (always compact, returns `bytes`) with the
+stdlib-compatible signature. Pre-serialized JSON can be emitted as an
+`orjson.Fragment`, which is embedded without re-encoding.
+"""
+
+from typing import Any
+
+import orjson
+
+
+def dumps(obj: Any, **kwargs: Any) -> str:
+    """Serialize `obj` to a JSON string (stdlib keyword arguments are ignored)."""
+    return orjson.dumps(obj).decode()
+
+
+def loads(s: str | bytes, **kwargs: Any) -> Any:
+    """Deserialize a JSON document (stdlib keyword arguments are ignored)."""
+    return orjson.loads(s)
@@ -124,4 +124,4 @@ else
 fi
 
 # Start the application
-exec poetry run uvicorn app.main:socket_app --host 0.0.0.0 --reload --port 8000
\ No newline at end of file
+exec poetry run uvicorn app.main:socket_app --host 0.0.0.0 --reload --port 8000 --loop uvloop
\ No newline at end of file
@@ -17,6 +17,9 @@ export default function SceneInfo({ scene, setIsModalOpen }: SceneInfoProps) {
     scene.messages.some((msg) => msg.character === char.id),
   );
 
+  // Count all messages, including the ones trimmed from the state
+  const messageCount = scene.messages_offset + scene.messages.length;
+
   // Calculate average response time
   const averageResponseTime =
     scene.messages.length > 1
@@ -162,7 +165,7 @@ export default function SceneInfo({ scene, setIsModalOpen }: SceneInfoProps) {
             <div className="space-y-1">
               <div className="flex items-center gap-1">
                 <span className="text-gray-100 text-sm sm:text-base">
-                  {scene.messages.length}
+                  {messageCount}
                 </span>
                 <span className="text-gray-400 text-xs">messages</span>
               </div>
@@ -184,7 +187,7 @@ export default function SceneInfo({ scene, setIsModalOpen }: SceneInfoProps) {
               )}
               <div className="flex items-center gap-1">
                 <span className="text-gray-100 text-sm sm:text-base">
-                  {(scene.messages.length / (elapsedSeconds / 60)).toFixed(1)}
+                  {(messageCount / (elapsedSeconds / 60)).toFixed(1)}
                 </span>
                 <span className="text-gray-400 text-xs">msg/min</span>
               </div>
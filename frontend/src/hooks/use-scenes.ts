@@ -4,6 +4,26 @@ import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import { useCallback, useEffect, useState } from 'react';
 
 const VOTED_PROPOSALS_KEY = 'pixeltales:voted_proposals';
+const VOTER_ID_KEY = 'pixeltales:voter_id';
+
+// Stable per-browser voter ID, lets the backend deduplicate repeated votes
+function getVoterId(): string | undefined {
+  try {
+    let voterId = localStorage.getItem(VOTER_ID_KEY);
+    if (!voterId) {
+      voterId = crypto.randomUUID();
+      localStorage.setItem(VOTER_ID_KEY, voterId);
+    }
+    return voterId;
+  } catch (error) {
+    Logger.error(
+      'use-scenes',
+      'Failed to get voter ID from localStorage:',
+      error,
+    );
+    return undefined;
+  }
+}
 
 // Helper functions for vote persistence
 function getVotedProposals(): Set<number> {
@@ -130,7 +150,7 @@ export function useSceneVote() {
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ vote }),
+        body: JSON.stringify({ vote, voter_id: getVoterId() }),
       });
       if (!response.ok) {
         throw new Error('Failed to vote on scene');
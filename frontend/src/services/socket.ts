@@ -1,4 +1,4 @@
-import type { SceneState } from '@/types/scene';
+import type { SceneState, SceneStatePatch } from '@/types/scene';
 import { io, Socket } from 'socket.io-client';
 import { Logger } from '../utils/logger';
 
@@ -18,6 +18,7 @@ class SocketService {
   private readonly MAX_RECONNECT_ATTEMPTS = 5;
   private readonly RECONNECT_DELAY = 2000; // 2 seconds
   private isConnecting = false;
+  private sceneState: SceneState | null = null;
 
   private constructor() {
     // Private constructor to enforce singleton
@@ -113,8 +114,44 @@ class SocketService {
 
     this.socket.on('scene_state', (state: SceneState) => {
       Logger.info(this.constructor.name, 'Received scene state update');
+      this.sceneState = state;
       this.notifyListeners('scene_state', state);
     });
+
+    this.socket.on('scene_state_patch', (patch: SceneStatePatch) => {
+      const state = this.applySceneStatePatch(patch);
+      if (!state) {
+        // Patch of another scene; the full state is sent on scene change
+        return;
+      }
+      this.sceneState = state;
+      this.notifyListeners('scene_state', state);
+    });
+  }
+
+  private applySceneStatePatch(patch: SceneStatePatch): SceneState | null {
+    const state = this.sceneState;
+    if (!state || state.scene_id !== patch.scene_id) {
+      return null;
+    }
+    const { characters, messages_from, messages, ...fields } = patch;
+    const offset = fields.messages_offset ?? state.messages_offset;
+    // Index of `messages_from` in the current (trimmed) messages
+    const from = Math.max(0, (messages_from ?? 0) - state.messages_offset);
+    return {
+      ...state,
+      ...fields,
+      characters: characters
+        ? { ...state.characters, ...characters }
+        : state.characters,
+      messages: !messages
+        ? state.messages
+        : from <= state.messages.length
+          ? [...state.messages.slice(0, from), ...messages].slice(
+              Math.max(0, offset - state.messages_offset),
+            )
+          : messages, // sent in full from the new offset on
+    };
   }
 
   disconnect(): void {
@@ -63,7 +63,8 @@ export interface SceneState {
   scene_id: number;
   scene_config_id: number;
   characters: Record<string, CharacterState>;
-  messages: Array<Message>;
+  messages: Array<Message>; // most recent messages
+  messages_offset: number; // number of earlier messages trimmed from `messages`
   started_at: number; // Unix timestamp (Epoch time)
   conversation_active: boolean;
   conversation_ended: boolean;
@@ -71,6 +72,15 @@ export interface SceneState {
   visitor_count: number; // number of current visitors in the scene
 }
 
+// Changes to the scene state since the previous broadcast
+export interface SceneStatePatch
+  extends Partial<Omit<SceneState, 'scene_id' | 'characters' | 'messages'>> {
+  scene_id: number;
+  characters?: Record<string, CharacterState>; // changed characters
+  messages_from?: number; // replace messages from this index (incl. offset) on...
+  messages?: Array<Message>; // ...with these messages
+}
+
 export interface CharacterConfig extends CharacterBase {
   initial_position?: Position;
   initial_direction?: Direction;